@@ -4,64 +4,112 @@ from scipy.stats import ttest_rel, wilcoxon
 import os
 
 def cohen_d(x, y):
+    # row-wise over NaN-padded (n_cases, N) stacks
     diff = x - y
-    return diff.mean() / diff.std(ddof=1)
-
-def bootstrap_ci(data, n_boot=1000, alpha=0.05):
-    means = []
-    for _ in range(n_boot):
-        sample = np.random.choice(data, size=len(data), replace=True)
-        means.append(sample.mean())
-    lower = np.percentile(means, 100*alpha/2)
-    upper = np.percentile(means, 100*(1-alpha/2))
+    return np.nanmean(diff, axis=1) / np.nanstd(diff, axis=1, ddof=1)
+
+# PCG64 generator; seeded so the reported CIs are reproducible
+rng = np.random.default_rng(42)
+
+def bootstrap_ci(data, lengths, n_boot=1000, alpha=0.05, max_bytes=64 * 2**20):
+    # data: (n_cases, N) stack, row i valid up to lengths[i] (NaN-padded after)
+    data = np.asarray(data)
+    lengths = np.asarray(lengths)
+    n_cases, n = data.shape
+    rows = np.arange(n_cases)[:, None, None]
+    valid = (np.arange(n) < lengths[:, None])[:, None, :]
+    # draw all resamples as an (n_cases, n_boot, N) index cube; chunk the n_boot
+    # axis so the indices + gathered samples (16 bytes/cell) stay under max_bytes
+    chunk = max(1, max_bytes // (16 * n_cases * n))
+    means = np.empty((n_cases, n_boot))
+    for start in range(0, n_boot, chunk):
+        stop = min(n_boot, start + chunk)
+        idx = rng.integers(0, lengths[:, None, None], size=(n_cases, stop - start, n))
+        samples = np.where(valid, data[rows, idx], 0.0)
+        means[:, start:stop] = samples.sum(axis=2) / lengths[:, None]
+    lower, upper = np.percentile(means, [100*alpha/2, 100*(1-alpha/2)], axis=1)
     return lower, upper
 
+def paired_values(base, ai, metric):
+    # pair each task's baseline and AI value: inner join on pid when both
+    # CSVs have it (unique per side), else the rows must already line up
+    if "pid" in base.columns and "pid" in ai.columns:
+        paired = base[["pid", metric]].merge(
+            ai[["pid", metric]], on="pid", suffixes=("_base", "_ai"),
+            validate="one_to_one").dropna()
+        return paired[f"{metric}_base"].values, paired[f"{metric}_ai"].values
+    x = base[metric].dropna().values
+    y = ai[metric].dropna().values
+    if len(x) != len(y):
+        raise ValueError(f"{metric}: {len(x)} baseline vs {len(y)} AI values and no pid column to pair them")
+    return x, y
+
 workloads = [
     "cpu_workload", "io_workload", "batch_workload",
     "real_time_workload", "stress_workload", "mixed_realistic_workload"
 ]
+metrics = ["turnaround", "response"]
 
-out_rows = []
-
+# collect every (workload, metric) pair first, reading each CSV once
+cases = []
 for w in workloads:
     base = pd.read_csv(f"results/{w}/linux_baseline_task_metrics.csv")
     ai   = pd.read_csv(f"results/{w}/ai_scheduler_task_metrics.csv")
 
-    for metric in ["turnaround", "response"]:
+    for metric in metrics:
         if metric not in base.columns or metric not in ai.columns:
             print(f"⚠️ Skipping {w} - {metric} (not found in CSV)")
             continue
 
-        x = base[metric].dropna().values
-        y = ai[metric].dropna().values
+        x, y = paired_values(base, ai, metric)
 
-        if len(x) == 0 or len(y) == 0:
+        if len(x) == 0:
             print(f"⚠️ No data for {w} - {metric}")
             continue
+        unpaired = base[metric].notna().sum() + ai[metric].notna().sum() - 2 * len(x)
+        if unpaired:
+            print(f"⚠️ {w} - {metric}: {unpaired} values without a matching pid left out")
+
+        cases.append((w, metric, x, y))
+
+out_rows = []
+
+if cases:
+    # stack into NaN-padded (n_cases, N) arrays so every test runs once, row-wise
+    lengths = np.array([len(x) for _, _, x, _ in cases])
+    X = np.full((len(cases), lengths.max()), np.nan)
+    Y = np.full_like(X, np.nan)
+    for i, (_, _, x, y) in enumerate(cases):
+        X[i, :len(x)] = x
+        Y[i, :len(y)] = y
+    diff = X - Y
 
-        diff = x - y
+    # stats
+    t_stat, p_ttest = ttest_rel(X, Y, axis=1, nan_policy="omit")
+    # normal approximation: never takes the exact-distribution path, and an
+    # all-zero row just comes back as NaN instead of raising
+    w_stat, p_wilcox = wilcoxon(diff, axis=1, nan_policy="omit",
+                                method="approx", zero_method="wilcox")
 
-        # stats
-        t_stat, p_ttest = ttest_rel(x, y)
-        try:
-            w_stat, p_wilcox = wilcoxon(diff)
-        except:
-            p_wilcox = np.nan  # if all diffs are zero
+    d = cohen_d(X, Y)
+    ci_low, ci_high = bootstrap_ci(diff, lengths)
 
-        d = cohen_d(x, y)
-        ci_low, ci_high = bootstrap_ci(diff)
+    base_mean = np.nanmean(X, axis=1)
+    ai_mean = np.nanmean(Y, axis=1)
+    diff_mean = np.nanmean(diff, axis=1)
 
+    for i, (w, metric, _, _) in enumerate(cases):
         out_rows.append({
             "Workload": w,
             "Metric": metric,
-            "Baseline_Mean": x.mean(),
-            "AI_Mean": y.mean(),
-            "Mean_Diff": diff.mean(),
-            "Cohen_d": d,
-            "Paired_ttest_p": p_ttest,
-            "Wilcoxon_p": p_wilcox,
-            "95%CI_low": ci_low,
-            "95%CI_high": ci_high
+            "Baseline_Mean": base_mean[i],
+            "AI_Mean": ai_mean[i],
+            "Mean_Diff": diff_mean[i],
+            "Cohen_d": d[i],
+            "Paired_ttest_p": p_ttest[i],
+            "Wilcoxon_p": p_wilcox[i],
+            "95%CI_low": ci_low[i],
+            "95%CI_high": ci_high[i]
         })
 
 df = pd.DataFrame(out_rows)
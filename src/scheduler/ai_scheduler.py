@@ -3,20 +3,99 @@
 # ------------------------------
 import heapq
 import itertools
+import functools
+import json
+import warnings
 from collections import deque, defaultdict
 import pandas as pd
 import numpy as np
 import time
+from .event_log import LogBuffer
+from .task import Task
+from .kernels import repeat_add, advance_ticks, compute_scores_batch, SUBQUEUE_WEIGHTS
+
+# numeric value of each class label (unknown labels count as 2)
+LABEL_NUMERIC = {
+    "resource": {"CPU-bound": 3, "Mixed": 2, "IO-bound": 1},
+    "interactivity": {"Real-time": 4, "Interactive": 3, "Other": 2, "Background": 1.5, "Batch": 1},
+    "execution": {"Short": 3, "Medium": 2, "Long": 1},
+    "priority": {"High": 3, "Medium": 2, "Low": 1},
+}
+
+def _int_if_complete(arr):
+    # tick-valued columns stay integer unless some task lacks the value
+    return arr if np.isnan(arr).any() else arr.astype(np.int64)
+
+@functools.lru_cache(maxsize=None)
+def _rr_quantum(score):
+    # RR quantum by subqueue score; scores come from a small label grid, so
+    # the cache acts as a precomputed score -> quantum table
+    base_score = 2.5
+    max_score = 3.15
+    base_quantum = 100
+    max_quantum = 200
+    if score <= base_score:
+        return base_quantum
+    elif score >= max_score:
+        return max_quantum
+    # Linear growth between base_score and max_score
+    frac = (score - base_score) / (max_score - base_score)
+    return int(base_quantum + frac * (max_quantum - base_quantum))
+
+@functools.lru_cache(maxsize=256)
+def _map_numeric_labels(resource, inter, exec_c, priority):
+    # only 3*5*3*3 label combinations (plus fallbacks), so this stays tiny
+    return (
+        LABEL_NUMERIC["resource"].get(resource, 2),
+        LABEL_NUMERIC["interactivity"].get(inter, 2),
+        LABEL_NUMERIC["execution"].get(exec_c, 2),
+        LABEL_NUMERIC["priority"].get(priority, 2)
+    )
+
+# (interactivity, execution, priority) numeric labels -> (scheduler, subqueue)
+# for the cases the labels decide alone: Real-time -> FIFO, and
+# Interactive+Short+High -> RR; everything else falls through to the score.
+# Looked up once at admission only; preempted RR/CFS tasks go straight back
+# to their own subqueue and FIFO tasks run to completion
+_DECISION_TABLE = {
+    **{(4, e, p): ("FIFO", "fifo_1") for e in (1, 2, 3) for p in (1, 2, 3)},
+    (3, 3, 3): ("RR", "rr_1"),
+}
+
+def _subqueue_decision(inter_num, exec_num, prio_num, score):
+    # (scheduler, subqueue) for a non-overridden policy
+    decision = _DECISION_TABLE.get((inter_num, exec_num, prio_num))
+    if decision is not None:
+        return decision
+    return ("RR", "rr_1") if score > 2.6 else ("CFS", "cfs_1")
+
+@functools.lru_cache(maxsize=None)
+def _load_feature_list(name):
+    # read once per process; every AIScheduler() shares the same lists
+    with open(f"{name}_features.json") as f:
+        return json.load(f)
 
 class AIScheduler:
 
+    # classifier heads: (model/encoder key, Task label attribute, fallback label)
+    _TASKS = (
+        ("resource", "resource_type", "Mixed"),
+        ("interactivity", "interactivity", "Other"),
+        ("priority", "priority_class", "Medium"),
+        ("execution", "execution_class", "Medium"),
+    )
+
     def __init__(self, num_cores=4, core_priority_order=None,
-                 rr_quantum=100, cfs_base_slice=4, seed=42, models=None, encoders=None):
+                 rr_quantum=100, cfs_base_slice=4, seed=42, models=None, encoders=None,
+                 log_runs=True):
         self.num_cores = num_cores
         self.rr_quantum = int(rr_quantum)
         self.cfs_base_slice = float(cfs_base_slice)  # used as base multiplier
         self.insertion_counter = itertools.count()
         self.seed = seed
+        # per-tick RUN events, logged like LinuxBaselineScheduler's; they are the
+        # dominant log volume, so callers that only need metrics can opt out
+        self.log_runs = log_runs
 
         # -----------------------------
         # ML Models + Encoders
@@ -44,11 +123,44 @@ class AIScheduler:
               "execution": le_execution
            }
 
+        # encoder class index -> label string; indexing classes_ decodes exactly
+        # like LabelEncoder.inverse_transform minus its per-call validation.
+        # Encoders without classes_ keep going through inverse_transform.
+        self._inv = {
+            k: np.asarray(e.classes_) if hasattr(e, "classes_") else None
+            for k, e in self.encoders.items()
+        }
+
+        # encoder class index -> numeric label, so predictions skip the string round-trip
+        self.num_lut = {
+            k: np.array([nums.get(c, 2) for c in getattr(self.encoders.get(k), "classes_", [])],
+                        dtype=np.float64)
+            for k, nums in LABEL_NUMERIC.items()
+        }
+
         self.feature_lists = {
-            "resource": json.load(open("resource_features.json")),
-            "interactivity": json.load(open("interactivity_features.json")),
-            "priority": json.load(open("priority_features.json")),
-            "execution": json.load(open("execution_features.json"))
+            k: _load_feature_list(k)
+            for k in ("resource", "interactivity", "priority", "execution")
+        }
+        # union of all heads' features (first-seen order) + per-head column
+        # indices into it, so each task's raw features are extracted once
+        self._all_feats = list(dict.fromkeys(
+            f for feats in self.feature_lists.values() for f in feats))
+        pos = {f: i for i, f in enumerate(self._all_feats)}
+        self._head_cols = {
+            k: np.array([pos[f] for f in feats], dtype=np.intp)
+            for k, feats in self.feature_lists.items()
+        }
+        # per-head prediction memo keyed on the exact feature row bytes
+        # (kernel threads/workers often share a vector); tied to self.models
+        self._pred_cache = {k: {} for k in self.feature_lists}
+        # heads whose fitted feature names (if any) are exactly this head's
+        # feature list: those get plain ndarrays, since the column check a
+        # DataFrame would buy is already done here once
+        self._names_ok = {
+            k: getattr(self.models.get(k), "feature_names_in_", None) is None
+               or list(self.models[k].feature_names_in_) == feats
+            for k, feats in self.feature_lists.items()
         }
 
         # per-core priority order
@@ -56,22 +168,40 @@ class AIScheduler:
             cid: ["FIFO", "RR", "CFS", "IDLE"] for cid in range(num_cores)
         }
 
+        # FIFO/RR/IDLE deques hold int indices into self.tasks; only RR
+        # re-enqueues on preemption (FIFO/IDLE always run to completion)
         self.queues = {
             "FIFO": {"fifo_1": deque()},
             "RR": {"rr_1": deque()},
-            "CFS": {"cfs_1": [] },   # min-heaps of (vruntime, counter, pid, task)
+            "CFS": {"cfs_1": [] },   # min-heaps of (vruntime, counter, gen, pid, task)
             "IDLE": {"idle": deque()}
         }
 
+        # flat views over the same queue objects (self.queues stays the nested,
+        # external layout): (sched, subq) -> queue for one-lookup access, and
+        # each scheduler's subqueues in order for head refreshes
+        self._subqueues = {
+            (sched, subq): q for sched, subqs in self.queues.items() for subq, q in subqs.items()
+        }
+        self._sched_subqueues = {sched: tuple(subqs.items()) for sched, subqs in self.queues.items()}
+        self._default_subq = {sched: next(iter(subqs)) for sched, subqs in self.queues.items()}
+
+        # cached front of each scheduler: (subq, task) of its first non-empty
+        # subqueue (min-vruntime entry for CFS), None when all its subqueues are empty
+        self.heads = {sched: None for sched in self.queues}
+
         # cores state: dict per core: {"task": Task or None, "time_left": int quantum remaining}
         self.cores = {cid: {"task": None, "time_left": 0} for cid in range(num_cores)}
 
         # runtime bookkeeping
         self.time = 0
-        self.logs = []            # list of event dicts
+        self.logs = LogBuffer()   # columnar event log
         self.task_map = {}        # pid -> Task
+        self.tasks = []           # append-only task table (task.idx -> Task)
         self.completed_tasks = {}
         self.context_switches = 0
+        self.cfs_total_weight = 0.0  # running sum of weights queued in CFS heaps
+        self.run_ticks_per_core = [0] * num_cores  # ticks each core spent running a task
 
         # small constants to approximate Linux behavior
         self.NICE0_WEIGHT = 1024.0  # used for vruntime update
@@ -81,79 +211,72 @@ class AIScheduler:
     # Utilities / helpers
     # --------------------
     def _log(self, event_type, task=None, core=None, extra=None):
-        row = {
-            "time": self.time,
-            "event": event_type,
-            "core": core,
-            "pid": getattr(task, "pid", None),
-            "name": getattr(task, "name", None),
-        }
-        if task is not None:
-            row.update({
-                "assigned_scheduler": task.assigned_scheduler,
-                "subqueue": task.subqueue,
-                "remaining": task.remaining,
-                "quantum": task.quantum,
-                "vruntime": getattr(task, "vruntime", None),
-                "subqueue_score": getattr(task, "subqueue_score", None),
-            })
-        if extra:
-            row.update(extra)
-        self.logs.append(row)
+        pid = None if task is None else task.pid
+        self.logs.append(self.time, event_type, core, pid, task, extra)
 
     def all_queues_empty(self):
-        # check both queue structures and running cores
-        for sched in self.queues:
-            for subq in self.queues[sched]:
-                if len(self.queues[sched][subq]) > 0:
-                    return False
-        for cid in self.cores:
-            if self.cores[cid]["task"] is not None:
-                return False
-        return True
+        # running cores are the cheap, usually decisive check; heads mirror
+        # queue occupancy (refreshed on every queue change)
+        if any(c["task"] is not None for c in self.cores.values()):
+            return False
+        return not any(head is not None for head in self.heads.values())
 
     # --------------------
     # Enqueue / Dequeue
     # --------------------
     def _cfs_insert(self, subq, task):
-        # push (vruntime, counter, pid, task)
-        entry = (float(task.vruntime), next(self.insertion_counter), task.pid, task)
-        heapq.heappush(self.queues["CFS"][subq], entry)
+        # push (vruntime, counter, gen, pid, task); bumping the task's generation
+        # turns any entry it still has in the heap into a stale tombstone
+        task._cfs_gen += 1
+        entry = (float(task.vruntime), next(self.insertion_counter), task._cfs_gen, task.pid, task)
+        heapq.heappush(self._subqueues[("CFS", subq)], entry)
+        self.cfs_total_weight += task.weight if task.weight > 0 else self.NICE0_WEIGHT
+        self._refresh_head("CFS")
 
     def _cfs_pop_min(self, subq):
-        heap = self.queues["CFS"][subq]
+        heap = self._subqueues[("CFS", subq)]
         while heap:
-            vr, _, pid, task = heapq.heappop(heap)
-            if abs(float(task.vruntime) - float(vr)) < 1e-6:
+            vr, _, gen, pid, task = heapq.heappop(heap)
+            self.cfs_total_weight -= task.weight if task.weight > 0 else self.NICE0_WEIGHT
+            if gen == task._cfs_gen:
+                self._refresh_head("CFS")
                 return task
-            else:
-                # stale entry: push a fresh one and continue popping next
-                entry = (float(task.vruntime), next(self.insertion_counter), task.pid, task)
-                heapq.heappush(heap, entry)
-                # continue popping - eventual correct entry will match
+            # stale entry: task was re-inserted since, its live entry is further down
+        self._refresh_head("CFS")
         return None
 
+    def _refresh_head(self, sched):
+        # call after every change to self.queues[sched]
+        for subq, q in self._sched_subqueues[sched]:
+            if q:
+                self.heads[sched] = (subq, q[0][4] if sched == "CFS" else self.tasks[q[0]])
+                return
+        self.heads[sched] = None
+
     def _enqueue_task(self, task):
         """Place task into the queue structure according to assigned_scheduler/subqueue."""
         sched = task.assigned_scheduler or "CFS"
-        subq = task.subqueue or (list(self.queues[sched].keys())[0])
+        subq = task.subqueue or self._default_subq[sched]
         if sched == "CFS":
             self._cfs_insert(subq, task)
         else:
-            self.queues[sched][subq].append(task)
+            self._subqueues[(sched, subq)].append(task.idx)
+            self._refresh_head(sched)
         self._log("ENQUEUE", task)
 
     def _dequeue_task(self, sched, subq):
         if sched == "CFS":
             return self._cfs_pop_min(subq)
         else:
-            q = self.queues[sched][subq]
-            return q.popleft() if q else None
+            q = self._subqueues[(sched, subq)]
+            task = self.tasks[q.popleft()] if q else None
+            self._refresh_head(sched)
+            return task
 
     # --------------------
     # Admission
     # --------------------
-    def admit(self, task, current_time=None):
+    def admit(self, task, current_time=None, classified=False):
         """
         AI-aware admit:
          - run ML classification + scoring (preserved exactly),
@@ -162,6 +285,7 @@ class AIScheduler:
          - set vruntime/weight from features if available,
          - set RR initial quantum if needed,
          - enqueue and log (Linux-style).
+        Pass classified=True when the labels were already set by classify_many.
         """
         if current_time is None:
             current_time = self.time
@@ -170,12 +294,15 @@ class AIScheduler:
         if getattr(task, "arrival_time", None) is None:
             task.arrival_time = int(current_time)
 
-        # Register in task_map
+        # Register in task_map and the task table
         self.task_map[task.pid] = task
+        task.idx = len(self.tasks)
+        self.tasks.append(task)
 
         # ---- AI classification + scoring (preserve your logic) ----
         # This may set: resource_type, interactivity, priority_class, execution_class
-        self._classify_task(task)
+        if not classified:
+            self._classify_task(task)
 
         # numeric labels (returns tuple) — calling for completeness (you keep original logic)
         try:
@@ -183,11 +310,13 @@ class AIScheduler:
         except Exception:
             pass
 
-        # compute combined subqueue score (sets task.subqueue_score)
-        try:
-            self._compute_subqueue_score(task)
-        except Exception:
-            pass
+        # compute combined subqueue score (sets task.subqueue_score);
+        # classify_many may already have scored the batch
+        if not classified or task.subqueue_score is None:
+            try:
+                self._compute_subqueue_score(task)
+            except Exception:
+                pass
 
         # Estimate remaining if not already present (keep conservative fallback)
         if getattr(task, "remaining", None) is None or task.remaining == 0:
@@ -216,19 +345,7 @@ class AIScheduler:
         # ---- For RR, set an initial quantum (Linux-like) ----
         if getattr(task, "assigned_scheduler", None) == "RR":
             # task.quantum = max(self.min_granularity, int(getattr(self, "rr_quantum", 5)))
-            base_score = 2.5
-            max_score = 3.15
-            base_quantum = 100
-            max_quantum = 200
-            score = float(getattr(task, "subqueue_score", 2.0))
-            if score <= base_score:
-                 task.quantum = base_quantum
-            elif score >= max_score:
-                task.quantum = max_quantum
-            else:
-               # Linear growth between base_score and max_score
-                frac = (score - base_score) / (max_score - base_score)
-                task.quantum = int(base_quantum + frac * (max_quantum - base_quantum))
+            task.quantum = _rr_quantum(float(getattr(task, "subqueue_score", 2.0)))
         else:
             # leave quantum to be computed at dispatch for CFS/FIFO (or None)
             task.quantum = getattr(task, "quantum", None)
@@ -238,9 +355,17 @@ class AIScheduler:
             self._log("ADMIT", task)
         except Exception:
             # fallback to appending a simple log row if _log is not available
-            self.logs.append({"time": current_time, "event": "ADMIT", "pid": getattr(task, "pid", None)})
+            self.logs.append(current_time, "ADMIT", pid=getattr(task, "pid", None))
 
         self._enqueue_task(task)
+        # labels, scheduler and CFS state are set; the raw row is no longer read
+        task.finalize_features()
+
+    def admit_batch(self, tasks, current_time=None):
+        """Admit all tasks arriving on one tick, classifying them in a single batch."""
+        self.classify_many(tasks)
+        for task in tasks:
+            self.admit(task, current_time, classified=True)
 
     # --------------------
     # AI helpers
@@ -252,41 +377,17 @@ class AIScheduler:
         Kept identical to your implementation (safe fallbacks included).
         """
         try:
-           # Resource
-           X_res = task.get_feature_vector("resource")
-           X_res = pd.DataFrame(X_res, columns=self.feature_lists["resource"])
-           pred_res = self.models["resource"].predict(X_res)[0]
-           try:
-              task.resource_type = self.encoders["resource"].inverse_transform([pred_res])[0]
-           except Exception:
-              task.resource_type = "Mixed"  # fallback safe default
-
-           # Interactivity
-           X_int = task.get_feature_vector("interactivity")
-           X_int = pd.DataFrame(X_int, columns=self.feature_lists["interactivity"])
-           pred_int = self.models["interactivity"].predict(X_int)[0]
-           try:
-              task.interactivity = self.encoders["interactivity"].inverse_transform([pred_int])[0]
-           except Exception:
-              task.interactivity = "Other"
-
-           # Priority
-           X_pri = task.get_feature_vector("priority")
-           X_pri = pd.DataFrame(X_pri, columns=self.feature_lists["priority"])
-           pred_pri = self.models["priority"].predict(X_pri)[0]
-           try:
-              task.priority_class = self.encoders["priority"].inverse_transform([pred_pri])[0]
-           except Exception:
-              task.priority_class = "Medium"
-
-           # Execution
-           X_exe = task.get_feature_vector("execution")
-           X_exe = pd.DataFrame(X_exe, columns=self.feature_lists["execution"])
-           pred_exe = self.models["execution"].predict(X_exe)[0]
-           try:
-              task.execution_class = self.encoders["execution"].inverse_transform([pred_exe])[0]
-           except Exception:
-              task.execution_class = "Medium"
+           raw = task.get_feature_vector_all(self._all_feats)
+           for kind, attr, default in self._TASKS:
+              X = raw[self._head_cols[kind]].reshape(1, -1)
+              pred = self._predict_cached(kind, X)[0]
+              try:
+                 setattr(task, attr, self._decode(kind, [pred])[0])
+              except Exception:
+                 setattr(task, attr, default)  # fallback safe default
+              nums = self._numeric(kind, [pred])
+              if nums is not None:
+                 setattr(task, f"{kind}_num", nums[0])
 
         except Exception as e:
                print(f"⚠️ Classification failed for PID={getattr(task,'pid',None)}: {e}")
@@ -295,23 +396,107 @@ class AIScheduler:
                task.priority_class = task.priority_class or "Medium"
                task.execution_class = task.execution_class or "Medium"
 
+    def classify_many(self, tasks):
+        """
+        Batched _classify_task: one K-row predict per model instead of K
+        single-row calls (same labels and fallbacks). admit_batch() calls it
+        once per arrival tick; callers admitting tasks themselves can classify
+        a whole list up front and then admit(..., classified=True).
+        """
+        if not tasks:
+            return
+        heads = self._TASKS
+        try:
+            raw = Task.stack_feature_matrix(tasks, self._all_feats)
+            head_nums = {}
+            for kind, attr, default in heads:
+                X = raw[:, self._head_cols[kind]]
+                preds = self._predict_cached(kind, X)
+                try:
+                    labels = self._decode(kind, preds)
+                except Exception:
+                    labels = [default] * len(tasks)  # fallback safe default
+                nums = self._numeric(kind, preds)
+                if nums is None:
+                    nums = [None] * len(tasks)
+                else:
+                    head_nums[kind] = nums
+                for task, label, num in zip(tasks, labels, nums):
+                    setattr(task, attr, label)
+                    setattr(task, f"{kind}_num", num)
+            # score the whole batch at once; if any head fell back, admit()
+            # scores those tasks one by one from the string labels instead
+            if len(head_nums) == len(heads):
+                scores = compute_scores_batch(
+                    head_nums["resource"], head_nums["interactivity"],
+                    head_nums["execution"], head_nums["priority"])
+                for task, score in zip(tasks, scores.tolist()):
+                    task.subqueue_score = score
+        except Exception as e:
+            print(f"⚠️ Batch classification failed for {len(tasks)} tasks: {e}")
+            for task in tasks:
+                self._classify_task(task)
+
+    @staticmethod
+    def _check_codes(preds, n):
+        # class codes must be integers in [0, n); plain indexing would wrap
+        # negatives, so reject them like LabelEncoder.inverse_transform does
+        preds = np.asarray(preds)
+        if preds.dtype.kind not in "iu" or (preds.size and (preds.min() < 0 or preds.max() >= n)):
+            raise ValueError(f"y contains previously unseen labels: {preds}")
+        return preds
+
+    def _decode(self, kind, preds):
+        """encoder.inverse_transform(preds) via the precomputed classes_ table."""
+        inv = self._inv.get(kind)
+        if inv is None:
+            return self.encoders[kind].inverse_transform(preds)
+        return inv[self._check_codes(preds, len(inv))]
+
+    def _numeric(self, kind, preds):
+        """Numeric labels for class codes, or None when there is no LUT / the codes don't fit it."""
+        lut = self.num_lut.get(kind)
+        if lut is None or len(lut) == 0:
+            return None
+        try:
+            return lut[self._check_codes(preds, len(lut))]
+        except ValueError:
+            return None
+
+    def _predict_cached(self, kind, X):
+        """model.predict(X) for one head, running the model only on unseen rows."""
+        cache = self._pred_cache[kind]
+        keys = [row.tobytes() for row in X]
+        miss = [i for i, key in enumerate(keys) if key not in cache]
+        if miss:
+            for i, pred in zip(miss, self._predict(kind, X[miss])):
+                cache[keys[i]] = pred
+        return np.array([cache[key] for key in keys])
+
+    def _predict(self, kind, X):
+        """model.predict on a bare ndarray once the head's feature names are checked."""
+        model = self.models[kind]
+        if not self._names_ok[kind]:
+            # let sklearn report the name/order mismatch as it would for a frame
+            return model.predict(pd.DataFrame(X, columns=self.feature_lists[kind]))
+        with warnings.catch_warnings():
+            # names verified in __init__; no per-call DataFrame just to re-check them
+            warnings.filterwarnings("ignore", message="X does not have valid feature names")
+            return model.predict(X)
+
     def _map_numeric_labels(self, resource, inter, exec_c, priority):
-        Rmap = {"CPU-bound": 3, "Mixed": 2, "IO-bound": 1}
-        Imap = {"Real-time": 4, "Interactive": 3, "Other": 2, "Background": 1.5, "Batch": 1}
-        Emap = {"Short": 3, "Medium": 2, "Long": 1}
-        Pmap = {"High": 3, "Medium": 2, "Low": 1}
-        return (
-            Rmap.get(resource, 2),
-            Imap.get(inter, 2),
-            Emap.get(exec_c, 2),
-            Pmap.get(priority, 2)
-        )
+        return _map_numeric_labels(resource, inter, exec_c, priority)
 
     def _compute_subqueue_score(self, task):
-        Rnum, Inum, Enum, Pnum = self._map_numeric_labels(
-            task.resource_type, task.interactivity, task.execution_class, task.priority_class
-        )
-        w_r, w_i, w_e, w_p = 0.2, 0.35, 0.2, 0.3
+        # numeric labels come straight from the classifier LUTs; map the
+        # strings only when classification fell back to default labels
+        nums = (task.resource_num, task.interactivity_num, task.execution_num, task.priority_num)
+        if any(n is None for n in nums):
+            nums = _map_numeric_labels(
+                task.resource_type, task.interactivity, task.execution_class, task.priority_class
+            )
+        Rnum, Inum, Enum, Pnum = nums
+        w_r, w_i, w_e, w_p = SUBQUEUE_WEIGHTS
         task.subqueue_score = float(w_r*Rnum + w_i*Inum + w_e*Enum + w_p*Pnum)
         return task.subqueue_score
 
@@ -324,22 +509,12 @@ class AIScheduler:
             task.assigned_scheduler = "IDLE"; task.subqueue = "idle"; return
 
         score = float(getattr(task, "subqueue_score", 0.0))
-        rt, inter, exec_t, prio = task.resource_type, task.interactivity, task.execution_class, task.priority_class
-
-        if inter == "Real-time":
-            task.assigned_scheduler = "FIFO"
-            task.subqueue = "fifo_1"
-            return
-
-        elif (inter == "Interactive" and exec_t == "Short" and (prio in ["High"])) or score > 2.6:
-            task.assigned_scheduler = "RR"
-            task.subqueue = "rr_1"
-            return
-
-        else :
-            task.assigned_scheduler = "CFS"
-            task.subqueue = "cfs_1"
-            return
+        # numeric keys from the (cached) string labels, so a classifier
+        # fallback label decides exactly like its string would
+        _, inum, enum, pnum = _map_numeric_labels(
+            task.resource_type, task.interactivity, task.execution_class, task.priority_class
+        )
+        task.assigned_scheduler, task.subqueue = _subqueue_decision(inum, enum, pnum, score)
 
     # --------------------
     # Core pick & dispatch
@@ -351,24 +526,11 @@ class AIScheduler:
         """
         order = self.core_priority_order.get(core_id, ["FIFO", "RR", "CFS", "IDLE"])
         for sched in order:
-            # within a scheduler prefer higher subqueue keys in order (fifo_1 before fifo_2)
-            subqueues = list(self.queues[sched].keys())
-            for subq in subqueues:
-                if len(self.queues[sched][subq]) == 0:
-                    continue
-                # for CFS peek min
-                if sched == "CFS":
-                    candidate = None
-                    heap = self.queues["CFS"][subq]
-                    # peek valid entry
-                    if heap:
-                        vr, _, pid, task = heap[0]
-                        candidate = task
-                else:
-                    candidate = self.queues[sched][subq][0]
-                if candidate is not None:
-                    # pick first available per scheduler priority
-                    return sched, subq
+            # heads track the first non-empty subqueue (fifo_1 before fifo_2)
+            head = self.heads[sched]
+            if head is not None:
+                # pick first available per scheduler priority
+                return sched, head[0]
         return None, None
 
     def _dispatch_to_core(self, core_id, sched, subq):
@@ -377,11 +539,8 @@ class AIScheduler:
             return None
         # initialize quantum for CFS using base slice formula if not RR/FIFO
         if sched == "CFS":
-            runnable_set_weight = sum(
-                 [t.weight if t.weight > 0 else self.NICE0_WEIGHT
-                 for subq in self.queues["CFS"].values()
-                  for _, _, _, t in subq]   # iterate over heap entries
-            )
+            # weight still queued in CFS (maintained on insert/pop)
+            runnable_set_weight = self.cfs_total_weight
             if runnable_set_weight <= 0:
                    runnable_set_weight = task.weight or self.NICE0_WEIGHT
             sched_latency_ticks = 48  # you can tune (Linux default ~48ms window)
@@ -402,19 +561,7 @@ class AIScheduler:
             task.quantum = max(1, int(task.remaining))
         elif sched == "RR":
             # task.quantum = max(self.min_granularity, int(self.rr_quantum))
-            base_score = 2.5
-            max_score = 3.15
-            base_quantum = 100
-            max_quantum = 200
-            score = float(getattr(task, "subqueue_score", 2.0))
-            if score <= base_score:
-                 task.quantum = base_quantum
-            elif score >= max_score:
-                task.quantum = max_quantum
-            else:
-               # Linear growth between base_score and max_score
-                frac = (score - base_score) / (max_score - base_score)
-                task.quantum = int(base_quantum + frac * (max_quantum - base_quantum))
+            task.quantum = _rr_quantum(float(getattr(task, "subqueue_score", 2.0)))
 
         else:
             task.quantum = max(1, int(task.remaining))
@@ -431,7 +578,7 @@ class AIScheduler:
     # --------------------
     # Per-tick execution
     # --------------------
-    def _update_vruntime(self, task, delta=1):
+    def _vruntime_delta(self, task, delta=1):
         # vruntime += delta * (NICE0_WEIGHT / weight)
         if task.weight <= 0:
             task.weight = 1.0
@@ -439,7 +586,10 @@ class AIScheduler:
         base_inc = float(delta) * (self.NICE0_WEIGHT / float(task.weight))
         score = float(getattr(task, "subqueue_score", 2.0))
         score_scale = 2.0 / max(0.5, score)   # >2 score → smaller increment
-        task.vruntime += base_inc * score_scale
+        return base_inc * score_scale
+
+    def _update_vruntime(self, task, delta=1):
+        task.vruntime += self._vruntime_delta(task, delta)
 
     def _run_one_tick_on_core(self, core_id):
         core = self.cores[core_id]
@@ -450,14 +600,18 @@ class AIScheduler:
         # run one tick
         task.remaining = max(0, int(task.remaining) - 1)
         task.total_run = getattr(task, "total_run", 0) + 1
+        self.run_ticks_per_core[core_id] += 1
         core["time_left"] = max(0, core["time_left"] - 1)
 
+        sched = task.assigned_scheduler
+
         # update vruntime only for CFS tasks
-        if task.assigned_scheduler == "CFS":
+        if sched == "CFS":
             self._update_vruntime(task, delta=1)
 
         # log run
-        self._log("RUN", task, core=core_id)
+        if self.log_runs:
+            self._log("RUN", task, core=core_id)
 
         # completion?
         if task.remaining <= 0:
@@ -469,31 +623,23 @@ class AIScheduler:
             core["time_left"] = 0
             return
 
-        # quantum expired?
-        if core["time_left"] <= 0:
-            # for RR → requeue to RR subqueue (round robin)
-            if task.assigned_scheduler == "RR":
+        # quantum expired? only RR/CFS can get here: FIFO/IDLE are dispatched
+        # with quantum = remaining, so the completion check above always fires first
+        if sched == "RR":
+            if core["time_left"] <= 0:
                 self._log("PREEMPT", task, core=core_id, extra={"reason": "quantum_expired"})
                 # requeue at end of its RR subqueue
-                self.queues["RR"][task.subqueue].append(task)
+                self._subqueues[("RR", task.subqueue)].append(task.idx)
+                self._refresh_head("RR")
                 core["task"] = None
                 core["time_left"] = 0
-            elif task.assigned_scheduler == "CFS":
+        elif sched == "CFS":
+            if core["time_left"] <= 0:
                 # update vruntime already updated per tick; re-insert to heap
                 self._log("PREEMPT", task, core=core_id, extra={"reason": "cfs_quantum_expired"})
                 self._cfs_insert(task.subqueue, task)
                 core["task"] = None
                 core["time_left"] = 0
-            elif task.assigned_scheduler == "FIFO":
-                # FIFO shouldn't preempt on quantum expiry (we set quantum=remaining). But if it happens, requeue front.
-                self._log("PREEMPT", task, core=core_id, extra={"reason": "fifo_preempt"})
-                self.queues["FIFO"][task.subqueue].appendleft(task)
-                core["task"] = None
-                core["time_left"] = 0
-            else:
-                # IDLE or others
-                core["task"] = None
-                core["time_left"] = 0
 
     # --------------------
     # Main tick (called every simulated second/tick)
@@ -512,54 +658,133 @@ class AIScheduler:
             # run one tick on the core (if any)
             self._run_one_tick_on_core(cid)
 
+    def quiet_ticks(self):
+        """
+        Number of upcoming ticks in which no core can complete, expire its
+        quantum or pick up queued work (inf if all cores idle and nothing queued).
+        """
+        quiet = float("inf")
+        idle = False
+        for core in self.cores.values():
+            task = core["task"]
+            if task is None:
+                idle = True
+            else:
+                # the event tick is the one where remaining or time_left hits 0
+                quiet = min(quiet, min(int(task.remaining), core["time_left"]) - 1)
+        if idle and any(head is not None for head in self.heads.values()):
+            return 0
+        return max(0, quiet)
+
+    def tick_advance(self, n_ticks, current_time=None):
+        """
+        Run n_ticks quiet ticks (see quiet_ticks) in one step, starting at
+        current_time: busy cores' countdowns move by n_ticks at once. With
+        log_runs, the per-tick RUN rows come from the compiled advance_ticks
+        kernel and are logged in the same tick/core order as tick().
+        """
+        if current_time is None:
+            current_time = self.time
+        current_time = int(current_time)
+        busy = [cid for cid in range(self.num_cores) if self.cores[cid]["task"] is not None]
+        if busy and self.log_runs:
+            tasks = [self.cores[cid]["task"] for cid in busy]
+            is_cfs = np.array([t.assigned_scheduler == "CFS" for t in tasks])
+            inc = np.array([self._vruntime_delta(t, delta=1) if c else 0.0
+                            for t, c in zip(tasks, is_cfs)], dtype=np.float64)
+            remaining = np.array([int(t.remaining) for t in tasks], dtype=np.int64)
+            vruntime = np.array([float(t.vruntime) for t in tasks], dtype=np.float64)
+            rem_out, vr_out = advance_ticks(remaining, vruntime, inc, is_cfs, n_ticks)
+            self.logs.append_runs(current_time, busy, tasks, rem_out, vr_out)
+            for j, task in enumerate(tasks):
+                if is_cfs[j]:
+                    task.vruntime = float(vruntime[j])
+        for cid in busy:
+            core = self.cores[cid]
+            task = core["task"]
+            task.remaining = int(task.remaining) - n_ticks
+            task.total_run = getattr(task, "total_run", 0) + n_ticks
+            self.run_ticks_per_core[cid] += n_ticks
+            core["time_left"] -= n_ticks
+            if task.assigned_scheduler == "CFS" and not self.log_runs:
+                # compiled repeated adds keep vruntime bit-identical to per-tick stepping
+                inc = self._vruntime_delta(task, delta=1)
+                task.vruntime = repeat_add(float(task.vruntime), inc, n_ticks)
+        self.time = current_time + n_ticks - 1
+
     # --------------------
     # Metrics & export
     # --------------------
     def export_logs(self):
-        return pd.DataFrame(self.logs)
+        return self.logs.to_frame()
+
+    def _task_metric_columns(self):
+        # per-task metrics for completed tasks (task_map order) as one array per column
+        pids = [pid for pid in self.task_map if pid in self.completed_tasks]
+        n = len(pids)
+        arrival = np.full(n, np.nan)
+        first = np.full(n, np.nan)
+        comp = np.full(n, np.nan)
+        exec_time = np.empty(n, dtype=np.int64)
+        names = np.empty(n, dtype=object)
+        scheds = np.empty(n, dtype=object)
+        subqs = np.empty(n, dtype=object)
+        for i, pid in enumerate(pids):
+            t = self.completed_tasks[pid]
+            a = getattr(t, "arrival_time", None)
+            f = getattr(t, "first_start", None)
+            c = getattr(t, "completion_time", None)
+            if a is not None:
+                arrival[i] = a
+            if f is not None:
+                first[i] = f
+            if c is not None:
+                comp[i] = c
+            exec_time[i] = getattr(t, "total_run", 0)
+            names[i] = t.name
+            scheds[i] = t.assigned_scheduler
+            subqs[i] = t.subqueue
+        waiting = first - arrival
+        turnaround = comp - arrival
+        stretch = np.divide(turnaround, exec_time, out=np.full(n, np.nan), where=exec_time > 0)
+        return {
+            "pid": np.array(pids), "name": names,
+            "arrival": _int_if_complete(arrival), "first_start": _int_if_complete(first),
+            "completion": _int_if_complete(comp),
+            "execution_time": exec_time, "waiting": _int_if_complete(waiting),
+            "turnaround": _int_if_complete(turnaround), "response": _int_if_complete(waiting),
+            "stretch": stretch,
+            "scheduler": scheds, "subqueue": subqs
+        }
+
+    def export_core_ticks(self):
+        # busy ticks per core, counted whether or not RUN events are logged
+        return pd.DataFrame({"core": np.arange(self.num_cores),
+                             "run_ticks": np.asarray(self.run_ticks_per_core, dtype=np.int64)})
 
     def export_task_metrics(self):
-        # build per-task metrics from completed_tasks + task_map
-        rows = []
-        for pid, task in self.task_map.items():
-            if pid in self.completed_tasks:
-                t = self.completed_tasks[pid]
-                arrival = getattr(t, "arrival_time", None)
-                first = getattr(t, "first_start", None)
-                comp = getattr(t, "completion_time", None)
-                exec_time = getattr(t, "total_run", 0)
-                waiting = (first - arrival) if (first is not None and arrival is not None) else None
-                turnaround = (comp - arrival) if (comp is not None and arrival is not None) else None
-                response = waiting
-                stretch = turnaround / exec_time if exec_time > 0 and turnaround is not None else None
-                rows.append({
-                    "pid": pid, "name": t.name,
-                    "arrival": arrival, "first_start": first, "completion": comp,
-                    "execution_time": exec_time, "waiting": waiting,
-                    "turnaround": turnaround, "response": response, "stretch": stretch,
-                    "scheduler": t.assigned_scheduler, "subqueue": t.subqueue
-                })
-        return pd.DataFrame(rows)
+        # build per-task metrics from completed_tasks + task_map, column-wise
+        return pd.DataFrame(self._task_metric_columns())
 
     def compute_aggregate_metrics(self):
-        df = self.export_task_metrics()
-        if df.empty:
+        cols = self._task_metric_columns()
+        if len(cols["pid"]) == 0:
             return {}
+        turnaround = cols["turnaround"]
+        response = cols["response"]
         metrics = {}
-        metrics["avg_turnaround"] = df["turnaround"].mean()
-        metrics["median_turnaround"] = df["turnaround"].median()
-        metrics["avg_response"] = df["response"].mean()
-        metrics["p95_response"] = df["response"].quantile(0.95)
+        metrics["avg_turnaround"] = np.nanmean(turnaround)
+        metrics["median_turnaround"] = np.nanmedian(turnaround)
+        metrics["avg_response"] = np.nanmean(response)
+        metrics["p95_response"] = np.nanpercentile(response, 95)
         # Jain fairness on execution_time vs share (simple)
-        execs = df["execution_time"].fillna(0).values
-        metrics["fairness_index"] = (execs.sum()**2) / (len(execs) * (np.sum(execs**2) + 1e-9))
+        execs = cols["execution_time"]
+        s = execs.sum()
+        metrics["fairness_index"] = (s * s) / (len(execs) * ((execs @ execs) + 1e-9))
         # core utilization estimate: sum of runtime on cores / simulation length
         total_time = max(1, self.time)
-        utiliz = {}
-        for cid in range(self.num_cores):
-            # approximate: count RUN events on core
-            core_runs = sum(1 for r in self.logs if r["event"] == "RUN" and r["core"] == cid)
-            utiliz[cid] = core_runs / total_time
+        # approximate: ticks spent running on each core (counted in _run_one_tick_on_core)
+        utiliz = {cid: self.run_ticks_per_core[cid] / total_time for cid in range(self.num_cores)}
         metrics["core_utilization"] = utiliz
         metrics["context_switches"] = self.context_switches
         total = len(self.task_map)
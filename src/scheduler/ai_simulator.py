@@ -3,18 +3,21 @@
 # ================================
 
 from .task import Task
+from .fast_forward import next_event_tick
 from .ai_scheduler import AIScheduler
 
 import pandas as pd
+import numpy as np
 import time
-from collections import defaultdict
 
 # --- Config ---
 INPUT_CSV = "ai_scheduler_input.csv"
 LOG_OUT   = "ai_scheduler_logs.csv"
 TASK_MET  = "ai_scheduler_task_metrics.csv"
+CORE_OUT  = "ai_scheduler_core_ticks.csv"
 MAX_SIM_SECONDS_MULT = 5
 PROGRESS_EVERY = 1000
+LOG_RUNS  = True   # per-tick RUN rows in LOG_OUT, same shape as the Linux baseline log
 
 # 1) Load dataset & prepare arrivals
 df = pd.read_csv(INPUT_CSV)
@@ -23,9 +26,12 @@ if "Timestamp" in df.columns:
 
 if 'Arrival_Sec' not in df.columns:
     if 'Timestamp' in df.columns and not df['Timestamp'].isnull().all():
-        start_ts = df['Timestamp'].min()
-        df['Arrival_Sec'] = ((df['Timestamp'] - start_ts).dt.total_seconds()
-                             .fillna(0).astype(int))
+        # whole seconds since the first timestamp, in one datetime64 pass (NaT -> 0)
+        ts = df['Timestamp'].to_numpy()
+        valid = ~np.isnat(ts)
+        arrival = np.zeros(len(ts), dtype=np.int32)
+        arrival[valid] = (ts[valid] - ts[valid].min()) // np.timedelta64(1, 's')
+        df['Arrival_Sec'] = arrival
     else:
         df['Arrival_Sec'] = 0
 
@@ -33,13 +39,17 @@ df = df.sort_values(by='Arrival_Sec').reset_index(drop=True)
 last_arrival = int(df['Arrival_Sec'].max())
 print(f"📊 Loaded dataset: {len(df)} tasks, last arrival @ {last_arrival}s")
 
-# Build arrivals dict for fast lookup
-arrivals = defaultdict(list)
-for _, row in df.iterrows():
-    arrivals[int(row['Arrival_Sec'])].append(row)
+# Dense per-tick arrivals table: arrivals_by_tick[t] = row positions arriving
+# at tick t (direct index, no dict hashing per tick), plus per-column arrays
+# so tasks are built by position instead of boxing a Series per row
+arrivals_by_tick = [[] for _ in range(last_arrival + 2)]
+for idx, sec in enumerate(df['Arrival_Sec'].to_numpy()):
+    arrivals_by_tick[sec].append(idx)
+cols = {c: df[c].to_numpy() for c in df.columns}
+arrival_ticks = [t for t, rows in enumerate(arrivals_by_tick) if rows]
 
 # 2) Initialize scheduler
-scheduler = AIScheduler(num_cores=4)   # tune cores if needed
+scheduler = AIScheduler(num_cores=4, log_runs=LOG_RUNS)   # tune cores if needed
 print("✅ AIScheduler initialized.")
 
 # 3) Compute recommended max_ticks
@@ -62,10 +72,21 @@ start_time_wall = time.time()
 
 while True:
     # Admit arrivals at this tick
-    if current_time in arrivals:
-        for row in arrivals[current_time]:
-            t = Task.from_row(row)
-            scheduler.admit(t, current_time)
+    if current_time <= last_arrival and arrivals_by_tick[current_time]:
+        tasks = [Task.from_arrays(cols, idx) for idx in arrivals_by_tick[current_time]]
+        scheduler.admit_batch(tasks, current_time)
+
+    # Fast-forward over quiet ticks (no completion, quantum expiry or idle pick
+    # possible) up to the next arrival / progress print / max_ticks
+    jump_to = next_event_tick(arrival_ticks, current_time, scheduler,
+                              PROGRESS_EVERY, max_ticks)
+    if jump_to is not None:
+        scheduler.tick_advance(jump_to - current_time, current_time)
+        current_time = jump_to
+        if current_time > max_ticks:
+            print("⚠️ Reached safety max_ticks — stopping simulation to avoid runaway.")
+            break
+        continue
 
     # Run one tick
     scheduler.tick(current_time)
@@ -96,6 +117,10 @@ task_metrics_df = scheduler.export_task_metrics()
 task_metrics_df.to_csv(TASK_MET, index=False)
 print(f"📊 Per-task metrics saved to {TASK_MET} (rows: {len(task_metrics_df)})")
 
+# busy ticks per core: CPU utilization without relying on per-tick RUN rows
+scheduler.export_core_ticks().to_csv(CORE_OUT, index=False)
+print(f"🧮 Core busy ticks saved to {CORE_OUT}")
+
 # 6) Print aggregate metrics in table
 agg = scheduler.compute_aggregate_metrics()
 print("\n📈 Aggregate metrics (AI Scheduler):")
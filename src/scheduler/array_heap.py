@@ -0,0 +1,51 @@
+# ------------------------------
+# Indexed array min-heap (CFS runqueue)
+# ------------------------------
+import numpy as np
+
+from .kernels import hpush, hpop
+
+
+class ArrayHeap:
+    """
+    Min-heap of task indices keyed by (vruntime, insertion seq), stored in
+    parallel numpy arrays and sifted by the compiled hpush/hpop kernels.
+    - no per-entry tuples; ties break on insertion order like the old heapq
+    - pos[idx] gives a task's slot (-1 if not queued)
+    """
+
+    def __init__(self, capacity=256):
+        self.size = 0
+        self.keys = np.empty(capacity, dtype=np.float64)
+        self.seqs = np.empty(capacity, dtype=np.int64)
+        self.vals = np.empty(capacity, dtype=np.int64)
+        self.pos = np.full(capacity, -1, dtype=np.int64)
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self, n_vals):
+        if self.size == len(self.keys):
+            cap = 2 * len(self.keys)
+            for name in ("keys", "seqs", "vals"):
+                arr = getattr(self, name)
+                new = np.empty(cap, dtype=arr.dtype)
+                new[:self.size] = arr[:self.size]
+                setattr(self, name, new)
+        if n_vals > len(self.pos):
+            pos = np.full(max(n_vals, 2 * len(self.pos)), -1, dtype=np.int64)
+            pos[:len(self.pos)] = self.pos
+            self.pos = pos
+
+    def push(self, key, seq, idx):
+        self._grow(idx + 1)
+        self.size = hpush(self.keys, self.seqs, self.vals, self.pos,
+                          self.size, float(key), seq, idx)
+
+    def pop(self):
+        idx = hpop(self.keys, self.seqs, self.vals, self.pos, self.size)
+        self.size -= 1
+        return int(idx)
+
+    def peek(self):
+        return int(self.vals[0])
@@ -7,6 +7,7 @@ import json
 import numpy as np
 import os
 import argparse
+import functools
 from pathlib import Path
 
 # -------------------------------
@@ -16,31 +17,45 @@ BASE_DIR = Path(__file__).resolve().parent
 MODELS_DIR = BASE_DIR.parent / "models"
 
 # ----------------------------------
-# Load models + encoders
+# Models + encoders + feature lists (lazy)
 # ----------------------------------
-rf_resource_model = joblib.load(MODELS_DIR / "resource_model_rf.pkl")
-le_resource = joblib.load(MODELS_DIR / "encoders/le_resource_model.pkl")
+# Loaded on first access of the module attribute (e.g. data_models.rf_resource_model)
+# and cached, so importing this module just for preprocess_dataset stays cheap.
+MODEL_FILES = {
+    "rf_resource_model": "resource_model_rf.pkl",
+    "le_resource": "encoders/le_resource_model.pkl",
+    "xgb_inter_model": "interactivity_model_xgb.pkl",
+    "le_inter": "encoders/le_interactivity_model.pkl",
+    "rf_priority_model": "priority_model_rf.pkl",
+    "le_priority": "encoders/le_priority_model.pkl",
+    "rf_execution_model": "execution_model_rf.pkl",
+    "le_execution": "encoders/le_execution_model.pkl",
+}
 
-xgb_inter_model = joblib.load(MODELS_DIR / "interactivity_model_xgb.pkl")
-le_inter = joblib.load(MODELS_DIR / "encoders/le_interactivity_model.pkl")
+FEATURE_FILES = {
+    "resource_feats": "features_json/resource_features.json",
+    "interactivity_feats": "features_json/interactivity_features.json",
+    "priority_feats": "features_json/priority_features.json",
+    "execution_feats": "features_json/execution_features.json",
+}
 
-rf_priority_model = joblib.load(MODELS_DIR / "priority_model_rf.pkl")
-le_priority = joblib.load(MODELS_DIR / "encoders/le_priority_model.pkl")
 
-rf_execution_model = joblib.load(MODELS_DIR / "execution_model_rf.pkl")
-le_execution = joblib.load(MODELS_DIR / "encoders/le_execution_model.pkl")
+@functools.cache
+def load_model(name):
+    return joblib.load(MODELS_DIR / MODEL_FILES[name])
 
-print("✅ Models + LabelEncoders loaded.")
 
-# ----------------------------------
-# Load feature lists
-# ----------------------------------
-resource_feats      = json.load(open(MODELS_DIR / "features_json/resource_features.json"))
-interactivity_feats = json.load(open(MODELS_DIR / "features_json/interactivity_features.json"))
-priority_feats      = json.load(open(MODELS_DIR / "features_json/priority_features.json"))
-execution_feats     = json.load(open(MODELS_DIR / "features_json/execution_features.json"))
+@functools.cache
+def load_feature_list(name):
+    return json.loads((MODELS_DIR / FEATURE_FILES[name]).read_bytes())
 
-print("✅ Feature sets loaded.")
+
+def __getattr__(name):
+    if name in MODEL_FILES:
+        return load_model(name)
+    if name in FEATURE_FILES:
+        return load_feature_list(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ----------------------------------
@@ -49,39 +64,62 @@ print("✅ Feature sets loaded.")
 def preprocess_dataset(df: pd.DataFrame) -> pd.DataFrame:
     """Clean + engineer features to match training pipeline."""
 
-    # Convert VmRSS (kB → float)
+    # Convert VmRSS (kB → float); the string round-trip is only needed for text columns
     if 'VmRSS' in df.columns:
-        df['VmRSS'] = (
-            df['VmRSS']
-            .astype(str)
-            .str.replace('kB', '', regex=False)
-            .astype(float)
-            .fillna(0.0)
-        )
-
-    # Safe numeric conversion
+        if pd.api.types.is_numeric_dtype(df['VmRSS']):
+            vmrss = df['VmRSS'].to_numpy(dtype=float)
+        else:
+            vmrss = np.char.replace(df['VmRSS'].to_numpy().astype(str), 'kB', '').astype(float)
+        df['VmRSS'] = np.where(np.isnan(vmrss), 0.0, vmrss)
+
+    # Safe numeric conversion: read_csv already typed most columns, so only
+    # object columns go through to_numeric; NaNs filled in one frame-wide pass
     num_cols = [
         'CPU_Usage_%','Nice','Priority','Total_Time_Ticks',
         'Elapsed_Time_sec','Voluntary_ctxt_switches','Nonvoluntary_ctxt_switches',
         'IO_Read_Bytes','IO_Write_Bytes','IO_Read_Count','IO_Write_Count',
         'se.sum_exec_runtime','se.load.weight'
     ]
-    for col in num_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-
-    # Avoid divide by zero
-    df['Elapsed_Time_sec'] = df['Elapsed_Time_sec'].replace(0, 1e-5)
-
-    # Engineered features
-    df['avg_cpu_time'] = df['Total_Time_Ticks'] / df['Elapsed_Time_sec']
-    df['cpu_to_elapsed_ratio'] = df['CPU_Usage_%'] / df['Elapsed_Time_sec']
-    df['interactivity_score'] = (
-        df['Voluntary_ctxt_switches'] / (df['Nonvoluntary_ctxt_switches'] + 1)
-    )
-    df['is_sleeping'] = (
-        df['State'].astype(str).str.lower().str.contains('sleeping', na=False).astype(int)
-    )
+    present = [col for col in num_cols if col in df.columns]
+    untyped = [col for col in present if not pd.api.types.is_numeric_dtype(df[col])]
+    if untyped:
+        df[untyped] = df[untyped].apply(pd.to_numeric, errors='coerce')
+    has_nan = [col for col in present if df[col].isna().any()]
+    if has_nan:
+        df[has_nan] = df[has_nan].fillna(0)
+
+    # Avoid divide by zero; the column is only rewritten (and so only becomes
+    # float) when it actually has zeros, like the old .replace(0, 1e-5)
+    elapsed = df['Elapsed_Time_sec'].to_numpy(dtype=float)
+    elapsed_zero = elapsed == 0
+    if elapsed_zero.any():
+        elapsed = np.where(elapsed_zero, 1e-5, elapsed)
+
+    # Engineered features, on the raw arrays
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_cpu_time = df['Total_Time_Ticks'].to_numpy(dtype=float) / elapsed
+        cpu_to_elapsed_ratio = df['CPU_Usage_%'].to_numpy(dtype=float) / elapsed
+        interactivity_score = (
+            df['Voluntary_ctxt_switches'].to_numpy(dtype=float)
+            / (df['Nonvoluntary_ctxt_switches'].to_numpy(dtype=float) + 1)
+        )
+
+    # is_sleeping: match 'sleeping' once per distinct State, then map the codes
+    state = df['State'].astype('category')
+    sleeping = np.asarray(state.cat.categories.astype(str).str.lower().str.contains('sleeping'))
+    codes = state.cat.codes.to_numpy()
+    # masked assignment: np.where would index sleeping[-1] eagerly, which
+    # fails when State is all-NaN (no categories)
+    is_sleeping = np.zeros(len(df), dtype=int)
+    valid = codes >= 0
+    is_sleeping[valid] = sleeping[codes[valid]]
+
+    if elapsed_zero.any():
+        df['Elapsed_Time_sec'] = elapsed
+    df['avg_cpu_time'] = avg_cpu_time
+    df['cpu_to_elapsed_ratio'] = cpu_to_elapsed_ratio
+    df['interactivity_score'] = interactivity_score
+    df['is_sleeping'] = is_sleeping
 
     return df
 
@@ -96,24 +134,36 @@ def main():
 
     args = parser.parse_args()
 
-    # Load dataset
-    df = pd.read_csv(args.input)
-    df['Timestamp'] = pd.to_datetime(df['Timestamp'], errors='coerce')
-    df = df.sort_values(by="Timestamp")
+    # Load dataset (Timestamp parsed during the read). collector.py writes
+    # datetime.isoformat(), which drops ".%f" when microseconds are 0, so use
+    # pandas' ISO8601 fast path rather than one fixed strptime format
+    df = pd.read_csv(args.input, parse_dates=["Timestamp"], date_format="ISO8601")
+    if not pd.api.types.is_datetime64_any_dtype(df['Timestamp']):
+        # read_csv leaves the column unparsed if any value is malformed
+        df['Timestamp'] = pd.to_datetime(df['Timestamp'], format="ISO8601", errors='coerce')
 
     print(f"📊 Original dataset shape: {df.shape}")
 
-    # Keep only first occurrence of each PID
-    first_occ = df.drop_duplicates(subset=["PID"], keep="first").reset_index(drop=True)
+    # Keep only first occurrence of each PID: earliest row per PID in one
+    # groupby pass, then order just those rows by time (ties keep file order).
+    # idxmin can't take an all-NaT group, so PIDs with no parseable Timestamp
+    # keep their first row and sort last, as NaT did in the old full sort
+    dated = df['Timestamp'].notna()
+    first_idx = df[dated].groupby("PID", sort=False, dropna=False)["Timestamp"].idxmin()
+    undated = df[~df['PID'].isin(first_idx.index)].drop_duplicates(subset=["PID"]).index
+    first_occ = (df.loc[np.concatenate([first_idx.to_numpy(), undated.to_numpy()])]
+                 .sort_values(by="Timestamp", kind="stable").reset_index(drop=True))
     print(f"📊 First occurrence dataset shape: {first_occ.shape}")
 
     # Apply preprocessing
     first_occ = preprocess_dataset(first_occ)
-    first_occ['Arrival_Sec'] = (
-        (first_occ['Timestamp'] - first_occ['Timestamp'].iloc[0])
-        .dt.total_seconds()
-        .astype(int)
-    )
+    # whole seconds since the first timestamp (NaT -> 0, like ai_simulator)
+    ts = first_occ['Timestamp'].to_numpy()
+    valid = ~np.isnat(ts)
+    arrival = np.zeros(len(ts), dtype=np.int32)
+    if valid.any():
+        arrival[valid] = (ts[valid] - ts[valid].min()) // np.timedelta64(1, 's')
+    first_occ['Arrival_Sec'] = arrival
 
     # Save
     out_path = Path(args.out)
@@ -0,0 +1,164 @@
+# ------------------------------
+# Columnar event log (struct-of-arrays)
+# ------------------------------
+import numpy as np
+import pandas as pd
+
+EVENT_NAMES = ["ADMIT", "ENQUEUE", "DISPATCH", "RUN", "COMPLETE", "PREEMPT"]
+EVENT_CODES = {name: i for i, name in enumerate(EVENT_NAMES)}
+
+MISSING = -1   # sentinel for None in integer columns
+
+
+class LogBuffer:
+    """
+    Scheduler event log stored as parallel typed arrays instead of a list of dicts.
+    - numeric fields live in preallocated numpy columns, doubled on overflow
+    - string fields (name, scheduler, subqueue) are interned to int codes
+    - sparse `extra` fields (e.g. PREEMPT reason) are kept per row index
+    to_frame() rebuilds the same columns the old list-of-dicts log produced.
+    """
+
+    NUMERIC = [
+        ("time", np.int32),
+        ("event", np.uint8),
+        ("core", np.int8),
+        ("pid", np.int32),
+        ("remaining", np.int32),
+        ("quantum", np.int32),
+        ("vruntime", np.float64),
+        ("subqueue_score", np.float64),
+    ]
+    STRINGS = ["name", "assigned_scheduler", "subqueue"]
+    COLUMNS = ["time", "event", "core", "pid", "name", "assigned_scheduler",
+               "subqueue", "remaining", "quantum", "vruntime", "subqueue_score"]
+
+    def __init__(self, capacity=1024):
+        self.n = 0
+        self.cap = int(capacity)
+        self.cols = {c: np.empty(self.cap, dtype=dt) for c, dt in self.NUMERIC}
+        for c in self.STRINGS:
+            self.cols[c] = np.empty(self.cap, dtype=np.int32)
+        self.has_task = np.zeros(self.cap, dtype=bool)
+        # interned string tables shared by the string columns
+        self.str_codes = {}
+        self.str_values = []
+        self.extra = {}     # column -> {row: value}
+
+    def __len__(self):
+        return self.n
+
+    def _grow(self, need=None):
+        need = self.cap + 1 if need is None else need
+        while self.cap < need:
+            self.cap *= 2
+        for c, arr in self.cols.items():
+            new = np.empty(self.cap, dtype=arr.dtype)
+            new[:self.n] = arr[:self.n]
+            self.cols[c] = new
+        has_task = np.zeros(self.cap, dtype=bool)
+        has_task[:self.n] = self.has_task[:self.n]
+        self.has_task = has_task
+
+    def _intern(self, value):
+        code = self.str_codes.get(value)
+        if code is None:
+            code = self.str_codes[value] = len(self.str_values)
+            self.str_values.append(value)
+        return code
+
+    def append(self, time, event, core=None, pid=None, task=None, extra=None):
+        i = self.n
+        if i == self.cap:
+            self._grow()
+        cols = self.cols
+        cols["time"][i] = time
+        cols["event"][i] = EVENT_CODES[event]
+        cols["core"][i] = MISSING if core is None else core
+        cols["pid"][i] = MISSING if pid is None else pid
+        if task is not None:
+            # Task.__slots__ are all set in __init__, so plain attribute reads
+            self.has_task[i] = True
+            cols["name"][i] = self._intern(task.name)
+            cols["assigned_scheduler"][i] = self._intern(task.assigned_scheduler)
+            cols["subqueue"][i] = self._intern(task.subqueue)
+            cols["remaining"][i] = task.remaining
+            quantum, vr, score = task.quantum, task.vruntime, task.subqueue_score
+            cols["quantum"][i] = MISSING if quantum is None else quantum
+            cols["vruntime"][i] = np.nan if vr is None else vr
+            cols["subqueue_score"][i] = np.nan if score is None else score
+        else:
+            self.has_task[i] = False
+            cols["name"][i] = self._intern(None)
+        if extra:
+            for k, v in extra.items():
+                self.extra.setdefault(k, {})[i] = v
+        self.n = i + 1
+
+    def append_runs(self, time0, cores, tasks, remaining, vruntime):
+        """
+        Bulk-append RUN rows for len(remaining) consecutive ticks starting at
+        time0, one row per (tick, core) in tick-major order. remaining and
+        vruntime are (n_ticks, k) post-run values for the k busy cores.
+        """
+        n_ticks, k = remaining.shape
+        i, n = self.n, n_ticks * k
+        if i + n > self.cap:
+            self._grow(i + n)
+        cols = self.cols
+        rows = slice(i, i + n)
+        cols["time"][rows] = np.repeat(np.arange(time0, time0 + n_ticks), k)
+        cols["event"][rows] = EVENT_CODES["RUN"]
+        cols["core"][rows] = np.tile(np.asarray(cores), n_ticks)
+        per_task = {
+            "pid": [MISSING if t.pid is None else t.pid for t in tasks],
+            "name": [self._intern(t.name) for t in tasks],
+            "assigned_scheduler": [self._intern(t.assigned_scheduler) for t in tasks],
+            "subqueue": [self._intern(t.subqueue) for t in tasks],
+            "quantum": [MISSING if t.quantum is None else t.quantum for t in tasks],
+            "subqueue_score": [np.nan if t.subqueue_score is None
+                               else t.subqueue_score for t in tasks],
+        }
+        for c, vals in per_task.items():
+            cols[c][rows] = np.tile(np.asarray(vals, dtype=cols[c].dtype), n_ticks)
+        cols["remaining"][rows] = remaining.ravel()
+        cols["vruntime"][rows] = vruntime.ravel()
+        self.has_task[rows] = True
+        self.n = i + n
+
+    def to_frame(self):
+        n = self.n
+        has_task = self.has_task[:n]
+        # interned code -> category code (-1 = missing); the extra last slot is
+        # used for rows without a task
+        categories = []
+        lut = np.full(len(self.str_values) + 1, -1, dtype=np.int32)
+        for j, v in enumerate(self.str_values):
+            if v is None or (isinstance(v, float) and v != v):
+                continue
+            lut[j] = len(categories)
+            categories.append(v)
+        categories = pd.Index(categories, dtype=object)
+        data = {}
+        for c in self.COLUMNS:
+            col = self.cols[c][:n]
+            if c == "event":
+                col = pd.Categorical.from_codes(col.astype(np.int8), EVENT_NAMES)
+            elif c in self.STRINGS:
+                if c != "name":
+                    col = np.where(has_task, col, len(self.str_values))
+                col = pd.Categorical.from_codes(lut[col], categories).remove_unused_categories()
+            else:
+                missing = ~has_task if c in ("remaining", "quantum", "vruntime", "subqueue_score") else None
+                if col.dtype.kind == "i":
+                    sentinel = col == MISSING
+                    missing = sentinel if missing is None else (missing | sentinel)
+                if missing is not None and missing.any():
+                    col = col.astype(np.float64)
+                    col[missing] = np.nan
+            data[c] = col
+        for k, rows in self.extra.items():
+            col = np.full(n, None, dtype=object)
+            col[list(rows.keys())] = list(rows.values())
+            data[k] = col
+        return pd.DataFrame(data, copy=False)
@@ -0,0 +1,26 @@
+# ------------------------------
+# Quiet-tick fast-forward shared by the simulation drivers
+# ------------------------------
+import bisect
+
+
+def next_event_tick(arrival_ticks, current_time, sched, progress_every, max_ticks):
+    # Tick the driver can jump to with sched.tick_advance() because nothing
+    # happens before it (no completion, quantum expiry or idle pick), capped
+    # at the next arrival / progress print / max_ticks + 1. None means step
+    # this tick normally. arrival_ticks must be sorted.
+    quiet = sched.quiet_ticks()
+    if quiet <= 0:
+        return None
+    nxt = bisect.bisect_right(arrival_ticks, current_time)
+    next_arrival = arrival_ticks[nxt] if nxt < len(arrival_ticks) else None
+    if quiet == float("inf") and next_arrival is None:
+        return None
+    next_progress = -(-current_time // progress_every) * progress_every
+    stop = min(next_arrival if next_arrival is not None else max_ticks + 1,
+               next_progress if next_progress > 0 else max_ticks + 1,
+               max_ticks + 1)
+    span = int(min(quiet, stop - current_time))
+    if span <= 0:
+        return None
+    return current_time + span
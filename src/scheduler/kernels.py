@@ -0,0 +1,111 @@
+# ------------------------------
+# Numba-compiled numeric kernels shared by the schedulers
+# ------------------------------
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def repeat_add(value, inc, n):
+    # value + inc applied n times, rounding after every add exactly like a
+    # per-tick Python loop (no fastmath, so LLVM may not fold it into n*inc)
+    for _ in range(n):
+        value += inc
+    return value
+
+
+@njit(cache=True)
+def advance_ticks(remaining, vruntime, inc, is_cfs, n_ticks):
+    # Run the busy cores' tasks (one slot per core) for n_ticks quiet ticks.
+    # remaining/vruntime are updated in place; the (n_ticks, k) outputs hold
+    # each tick's post-run values, i.e. what that tick's RUN event records.
+    k = remaining.shape[0]
+    rem_out = np.empty((n_ticks, k), dtype=np.int64)
+    vr_out = np.empty((n_ticks, k), dtype=np.float64)
+    for t in range(n_ticks):
+        for j in range(k):
+            remaining[j] -= 1
+            if is_cfs[j]:
+                vruntime[j] += inc[j]
+            rem_out[t, j] = remaining[j]
+            vr_out[t, j] = vruntime[j]
+    return rem_out, vr_out
+
+
+# subqueue score weights for the (resource, interactivity, execution, priority)
+# numeric labels; globals are frozen into the kernel at compile time
+SUBQUEUE_WEIGHTS = (0.2, 0.35, 0.2, 0.3)
+
+
+@njit(cache=True)
+def compute_scores_batch(R, I, E, P):
+    # w_r*R + w_i*I + w_e*E + w_p*P per task, float64 and summed left to right
+    # like the scalar _compute_subqueue_score, so the values are bit-identical
+    w_r, w_i, w_e, w_p = SUBQUEUE_WEIGHTS
+    out = np.empty(R.shape[0], dtype=np.float64)
+    for i in range(R.shape[0]):
+        out[i] = w_r*R[i] + w_i*I[i] + w_e*E[i] + w_p*P[i]
+    return out
+
+
+# ---- indexed binary min-heap over parallel arrays ----
+# entries are (key, seq) -> val ordered like (key, seq) tuples; pos[val] is the
+# entry's slot (-1 when not queued). Same sift order as heapq.
+
+@njit(cache=True)
+def _heap_less(keys, seqs, i, key, seq):
+    return key < keys[i] or (key == keys[i] and seq < seqs[i])
+
+
+@njit(cache=True)
+def _heap_move(keys, seqs, vals, pos, dst, src):
+    keys[dst] = keys[src]
+    seqs[dst] = seqs[src]
+    vals[dst] = vals[src]
+    pos[vals[dst]] = dst
+
+
+@njit(cache=True)
+def _heap_siftdown(keys, seqs, vals, pos, start, i, key, seq, val):
+    # move (key, seq, val) from slot i up towards start
+    while i > start:
+        parent = (i - 1) >> 1
+        if _heap_less(keys, seqs, parent, key, seq):
+            _heap_move(keys, seqs, vals, pos, i, parent)
+            i = parent
+        else:
+            break
+    keys[i] = key
+    seqs[i] = seq
+    vals[i] = val
+    pos[val] = i
+
+
+@njit(cache=True)
+def hpush(keys, seqs, vals, pos, size, key, seq, val):
+    _heap_siftdown(keys, seqs, vals, pos, 0, size, key, seq, val)
+    return size + 1
+
+
+@njit(cache=True)
+def hpop(keys, seqs, vals, pos, size):
+    # pop the min entry's val (size must be > 0); caller shrinks size by one
+    top = vals[0]
+    pos[top] = -1
+    last = size - 1
+    if last == 0:
+        return top
+    key, seq, val = keys[last], seqs[last], vals[last]
+    # heapq._siftup: walk the smaller child down to a leaf, then sift up
+    i = 0
+    child = 1
+    while child < last:
+        right = child + 1
+        if right < last and not (keys[child] < keys[right] or
+                                 (keys[child] == keys[right] and seqs[child] < seqs[right])):
+            child = right
+        _heap_move(keys, seqs, vals, pos, i, child)
+        i = child
+        child = 2 * i + 1
+    _heap_siftdown(keys, seqs, vals, pos, 0, i, key, seq, val)
+    return top
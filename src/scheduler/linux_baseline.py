@@ -1,13 +1,16 @@
 # ------------------------------
 # LinuxBaselineScheduler
 # ------------------------------
-import heapq
 import itertools
 from collections import deque, defaultdict
 import pandas as pd
 import numpy as np
 import time
 
+from .kernels import advance_ticks
+from .array_heap import ArrayHeap
+from .event_log import EVENT_CODES, LogBuffer
+
 class LinuxBaselineScheduler:
     """
     A lightweight Linux-like baseline scheduler simulator.
@@ -34,17 +37,40 @@ class LinuxBaselineScheduler:
         self.queues = {
             "FIFO": {"fifo_1": deque()},
             "RR": {"rr_1": deque()},
-            "CFS": {"cfs_1": []},   # min-heaps of (vruntime, counter, pid, task)
+            "CFS": {"cfs_1": ArrayHeap()},   # min-heaps of task idx keyed by (vruntime, counter)
             "IDLE": {"idle": deque()}
         }
 
+        # ready bitmap: bit sched_idx*8 + subq_idx is set iff that queue is non-empty
+        self._slot_bit = {}
+        self._slot_names = {}
+        for si, sched in enumerate(self.queues):
+            for qi, subq in enumerate(self.queues[sched]):
+                b = si * 8 + qi
+                self._slot_bit[(sched, subq)] = b
+                self._slot_names[b] = (sched, subq)
+        self._ready_mask = 0
+        # per core: one bit mask per scheduler, in that core's priority order
+        self._order_masks = {
+            cid: [sum(1 << self._slot_bit[(sched, subq)] for subq in self.queues[sched])
+                  for sched in self.core_priority_order.get(cid, ["FIFO", "RR", "CFS", "IDLE"])]
+            for cid in range(num_cores)
+        }
+
+        self._expire_handlers = {
+            "RR": self._expire_rr, "CFS": self._expire_cfs,
+            "FIFO": self._expire_fifo, "IDLE": self._expire_idle,
+        }
+
         # cores state: dict per core: {"task": Task or None, "time_left": int quantum remaining}
         self.cores = {cid: {"task": None, "time_left": 0} for cid in range(num_cores)}
 
         # runtime bookkeeping
         self.time = 0
-        self.logs = []            # list of event dicts
+        self.logs = LogBuffer()   # columnar event log
         self.task_map = {}        # pid -> Task
+        self.tasks = []           # task idx -> Task (CFS heaps hold indices)
+        self.cfs_total_weight = 0.0  # running sum of queued CFS weights
         self.completed_tasks = {}
         self.context_switches = 0
 
@@ -56,58 +82,35 @@ class LinuxBaselineScheduler:
     # Utilities / helpers
     # --------------------
     def _log(self, event_type, task=None, core=None, extra=None):
-        row = {
-            "time": self.time,
-            "event": event_type,
-            "core": core,
-            "pid": getattr(task, "pid", None),
-            "name": getattr(task, "name", None),
-        }
-        if task is not None:
-            row.update({
-                "assigned_scheduler": task.assigned_scheduler,
-                "subqueue": task.subqueue,
-                "remaining": task.remaining,
-                "quantum": task.quantum,
-                "vruntime": getattr(task, "vruntime", None),
-                "subqueue_score": getattr(task, "subqueue_score", None),
-            })
-        if extra:
-            row.update(extra)
-        self.logs.append(row)
+        pid = None if task is None else task.pid
+        self.logs.append(self.time, event_type, core, pid, task, extra)
 
     def all_queues_empty(self):
-        # check both queue structures and running cores
-        for sched in self.queues:
-            for subq in self.queues[sched]:
-                if len(self.queues[sched][subq]) > 0:
-                    return False
-        for cid in self.cores:
-            if self.cores[cid]["task"] is not None:
-                return False
-        return True
+        # running cores are the cheap, usually decisive check; the ready
+        # bitmap has one bit per non-empty subqueue
+        if any(c["task"] is not None for c in self.cores.values()):
+            return False
+        return not self._ready_mask
 
     # --------------------
     # Enqueue / Dequeue
     # --------------------
     def _cfs_insert(self, subq, task):
-        # push (vruntime, counter, pid, task)
-        entry = (float(task.vruntime), next(self.insertion_counter), task.pid, task)
-        heapq.heappush(self.queues["CFS"][subq], entry)
+        # push idx keyed by (vruntime, counter)
+        self.queues["CFS"][subq].push(task.vruntime, next(self.insertion_counter), task.idx)
+        self.cfs_total_weight += task.weight if task.weight > 0 else self.NICE0_WEIGHT
+        self._ready_mask |= 1 << self._slot_bit[("CFS", subq)]
 
     def _cfs_pop_min(self, subq):
+        # vruntime only changes while a task is running (off the heap), so
+        # entries are never stale and the min is always valid
         heap = self.queues["CFS"][subq]
-        while heap:
-            vr, _, pid, task = heapq.heappop(heap)
-            # lazy validity: if task.vruntime changed, the popped entry might be stale.
-            # But we accept small differences; if wildly different, reinsert with current vruntime.
-            if abs(float(task.vruntime) - float(vr)) < 1e-6:
-                return task
-            else:
-                # stale entry: push a fresh one and continue popping next
-                entry = (float(task.vruntime), next(self.insertion_counter), task.pid, task)
-                heapq.heappush(heap, entry)
-                # continue popping - eventual correct entry will match
+        if heap:
+            task = self.tasks[heap.pop()]
+            self.cfs_total_weight -= task.weight if task.weight > 0 else self.NICE0_WEIGHT
+            if not heap:
+                self._ready_mask &= ~(1 << self._slot_bit[("CFS", subq)])
+            return task
         return None
 
     def _enqueue_task(self, task):
@@ -118,6 +121,7 @@ class LinuxBaselineScheduler:
             self._cfs_insert(subq, task)
         else:
             self.queues[sched][subq].append(task)
+            self._ready_mask |= 1 << self._slot_bit[(sched, subq)]
         self._log("ENQUEUE", task)
 
     def _dequeue_task(self, sched, subq):
@@ -125,7 +129,12 @@ class LinuxBaselineScheduler:
             return self._cfs_pop_min(subq)
         else:
             q = self.queues[sched][subq]
-            return q.popleft() if q else None
+            if not q:
+                return None
+            task = q.popleft()
+            if not q:
+                self._ready_mask &= ~(1 << self._slot_bit[(sched, subq)])
+            return task
 
     # --------------------
     # Admission
@@ -136,6 +145,8 @@ class LinuxBaselineScheduler:
             current_time = self.time
         task.arrival_time = int(task.arrival_time) if hasattr(task, "arrival_time") else int(current_time)
         self.task_map[task.pid] = task
+        task.idx = len(self.tasks)
+        self.tasks.append(task)
 
         # use explicit Scheduling_Policy if provided in features
         sched_pol = str(task.features.get("Scheduling_Policy", "")).upper()
@@ -168,6 +179,9 @@ class LinuxBaselineScheduler:
         else:
             task.quantum = None
 
+        # scheduler is fixed from here on, so bind its quantum-expiry handler once
+        task._on_quantum_expire = self._expire_handlers.get(task.assigned_scheduler, self._expire_idle)
+
         # final enqueue
         self._log("ADMIT", task)
         self._enqueue_task(task)
@@ -176,26 +190,12 @@ class LinuxBaselineScheduler:
     # Core pick & dispatch
     # --------------------
     def _pick_task_for_core(self, core_id):
-        order = self.core_priority_order.get(core_id, ["FIFO", "RR", "CFS", "IDLE"])
-        for sched in order:
-            # within a scheduler prefer higher subqueue keys in order (fifo_1 before fifo_2)
-            subqueues = list(self.queues[sched].keys())
-            for subq in subqueues:
-                if len(self.queues[sched][subq]) == 0:
-                    continue
-                # for CFS peek min
-                if sched == "CFS":
-                    candidate = None
-                    heap = self.queues["CFS"][subq]
-                    # peek valid entry
-                    if heap:
-                        vr, _, pid, task = heap[0]
-                        candidate = task
-                else:
-                    candidate = self.queues[sched][subq][0]
-                if candidate is not None:
-                    # pick first available per scheduler priority
-                    return sched, subq
+        # first scheduler (core priority order) with a non-empty subqueue; within
+        # a scheduler the lowest set bit is the first subqueue (fifo_1 before fifo_2)
+        for sched_mask in self._order_masks[core_id]:
+            cand = self._ready_mask & sched_mask
+            if cand:
+                return self._slot_names[(cand & -cand).bit_length() - 1]
         return None, None
 
     def _dispatch_to_core(self, core_id, sched, subq):
@@ -204,11 +204,8 @@ class LinuxBaselineScheduler:
             return None
         # initialize quantum for CFS using base slice formula if not RR/FIFO
         if sched == "CFS":
-            runnable_set_weight = sum(
-                 [t.weight if t.weight > 0 else self.NICE0_WEIGHT
-                 for subq in self.queues["CFS"].values()
-                  for _, _, _, t in subq]   # iterate over heap entries
-            )
+            # weight still queued after this pop (kept incrementally)
+            runnable_set_weight = self.cfs_total_weight
             if runnable_set_weight <= 0:
                    runnable_set_weight = task.weight or self.NICE0_WEIGHT
             sched_latency_ticks = 48  # you can tune (Linux default ~48ms window)
@@ -271,31 +268,41 @@ class LinuxBaselineScheduler:
             core["time_left"] = 0
             return
 
-        # quantum expired?
+        # quantum expired? -> the task's per-scheduler handler (bound at admit)
         if core["time_left"] <= 0:
-            # for RR → requeue to RR subqueue (round robin)
-            if task.assigned_scheduler == "RR":
-                self._log("PREEMPT", task, core=core_id, extra={"reason": "quantum_expired"})
-                # requeue at end of its RR subqueue
-                self.queues["RR"][task.subqueue].append(task)
-                core["task"] = None
-                core["time_left"] = 0
-            elif task.assigned_scheduler == "CFS":
-                # update vruntime already updated per tick; re-insert to heap
-                self._log("PREEMPT", task, core=core_id, extra={"reason": "cfs_quantum_expired"})
-                self._cfs_insert(task.subqueue, task)
-                core["task"] = None
-                core["time_left"] = 0
-            elif task.assigned_scheduler == "FIFO":
-                # FIFO shouldn't preempt on quantum expiry (we set quantum=remaining). But if it happens, requeue front.
-                self._log("PREEMPT", task, core=core_id, extra={"reason": "fifo_preempt"})
-                self.queues["FIFO"][task.subqueue].appendleft(task)
-                core["task"] = None
-                core["time_left"] = 0
-            else:
-                # IDLE or others
-                core["task"] = None
-                core["time_left"] = 0
+            task._on_quantum_expire(task, core_id)
+
+    # --------------------
+    # Quantum-expiry handlers (one per scheduler, picked in admit)
+    # --------------------
+    def _expire_rr(self, task, core_id):
+        # for RR → requeue to RR subqueue (round robin)
+        self._log("PREEMPT", task, core=core_id, extra={"reason": "quantum_expired"})
+        # requeue at end of its RR subqueue
+        self.queues["RR"][task.subqueue].append(task)
+        self._ready_mask |= 1 << self._slot_bit[("RR", task.subqueue)]
+        self._clear_core(core_id)
+
+    def _expire_cfs(self, task, core_id):
+        # update vruntime already updated per tick; re-insert to heap
+        self._log("PREEMPT", task, core=core_id, extra={"reason": "cfs_quantum_expired"})
+        self._cfs_insert(task.subqueue, task)
+        self._clear_core(core_id)
+
+    def _expire_fifo(self, task, core_id):
+        # FIFO shouldn't preempt on quantum expiry (we set quantum=remaining). But if it happens, requeue front.
+        self._log("PREEMPT", task, core=core_id, extra={"reason": "fifo_preempt"})
+        self.queues["FIFO"][task.subqueue].appendleft(task)
+        self._ready_mask |= 1 << self._slot_bit[("FIFO", task.subqueue)]
+        self._clear_core(core_id)
+
+    def _expire_idle(self, task, core_id):
+        # IDLE or others
+        self._clear_core(core_id)
+
+    def _clear_core(self, core_id):
+        self.cores[core_id]["task"] = None
+        self.cores[core_id]["time_left"] = 0
 
     # --------------------
     # Main tick (called every simulated second/tick)
@@ -314,11 +321,75 @@ class LinuxBaselineScheduler:
             # run one tick on the core (if any)
             self._run_one_tick_on_core(cid)
 
+    def quiet_ticks(self):
+        """
+        Number of upcoming ticks in which no core can complete, expire its
+        quantum or pick up queued work (inf if all cores idle and nothing queued).
+        """
+        quiet = float("inf")
+        idle = False
+        for core in self.cores.values():
+            task = core["task"]
+            if task is None:
+                idle = True
+            else:
+                # the event tick is the one where remaining or time_left hits 0
+                quiet = min(quiet, min(int(task.remaining), core["time_left"]) - 1)
+        if idle and self._ready_mask:
+            return 0
+        return max(0, quiet)
+
+    def tick_advance(self, n_ticks, current_time=None):
+        """
+        Run n_ticks quiet ticks (see quiet_ticks) starting at current_time.
+        The per-tick countdowns run in the compiled advance_ticks kernel;
+        the RUN rows it returns are logged in the same tick/core order as tick().
+        """
+        if current_time is None:
+            current_time = self.time
+        current_time = int(current_time)
+        busy = [cid for cid in range(self.num_cores) if self.cores[cid]["task"] is not None]
+        if not busy:
+            self.time = current_time + n_ticks - 1
+            return
+        tasks = [self.cores[cid]["task"] for cid in busy]
+        for task in tasks:
+            # same weight guard _update_vruntime applies on a task's first tick
+            if task.assigned_scheduler == "CFS" and task.weight <= 0:
+                task.weight = 1.0
+        remaining = np.array([int(t.remaining) for t in tasks], dtype=np.int64)
+        vruntime = np.array([float(t.vruntime) for t in tasks], dtype=np.float64)
+        is_cfs = np.array([t.assigned_scheduler == "CFS" for t in tasks])
+        inc = np.array([1.0 * (self.NICE0_WEIGHT / float(t.weight)) if c else 0.0
+                        for t, c in zip(tasks, is_cfs)], dtype=np.float64)
+        rem_out, vr_out = advance_ticks(remaining, vruntime, inc, is_cfs, n_ticks)
+        self.logs.append_runs(current_time, busy, tasks, rem_out, vr_out)
+
+        for j, cid in enumerate(busy):
+            task = tasks[j]
+            task.remaining = int(remaining[j])
+            if is_cfs[j]:
+                task.vruntime = float(vruntime[j])
+            task.total_run = getattr(task, "total_run", 0) + n_ticks
+            self.cores[cid]["time_left"] -= n_ticks
+        self.time = current_time + n_ticks - 1
+
     # --------------------
     # Metrics & export
     # --------------------
     def export_logs(self):
-        return pd.DataFrame(self.logs)
+        return self.logs.to_frame()
+
+    def _core_run_ticks(self):
+        # RUN events per core in one bincount over the log columns
+        n = len(self.logs)
+        run_mask = self.logs.cols["event"][:n] == EVENT_CODES["RUN"]
+        return np.bincount(self.logs.cols["core"][:n][run_mask], minlength=self.num_cores)
+
+    def export_core_ticks(self):
+        # busy ticks per core (same shape as AIScheduler.export_core_ticks)
+        return pd.DataFrame({"core": np.arange(self.num_cores),
+                             "run_ticks": self._core_run_ticks().astype(np.int64)})
 
     def export_task_metrics(self):
         # build per-task metrics from completed_tasks + task_map
@@ -357,11 +428,9 @@ class LinuxBaselineScheduler:
         metrics["fairness_index"] = (execs.sum()**2) / (len(execs) * (np.sum(execs**2) + 1e-9))
         # core utilization estimate: sum of runtime on cores / simulation length
         total_time = max(1, self.time)
-        utiliz = {}
-        for cid in range(self.num_cores):
-            # approximate: count RUN events on core
-            core_runs = sum(1 for r in self.logs if r["event"] == "RUN" and r["core"] == cid)
-            utiliz[cid] = core_runs / total_time
+        # approximate: count RUN events per core in one bincount over the log columns
+        core_runs = self._core_run_ticks()
+        utiliz = {cid: int(core_runs[cid]) / total_time for cid in range(self.num_cores)}
         metrics["core_utilization"] = utiliz
         metrics["context_switches"] = self.context_switches
         total = len(self.task_map)
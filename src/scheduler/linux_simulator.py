@@ -3,6 +3,7 @@
 # ------------------------------
 
 from .task import Task
+from .fast_forward import next_event_tick
 from .linux_baseline import LinuxBaselineScheduler
 
 import pandas as pd
@@ -14,6 +15,7 @@ import time
 INPUT_CSV = "ai_scheduler_input.csv"
 LOG_OUT   = "linux_baseline_logs.csv"
 TASK_MET  = "linux_baseline_task_metrics.csv"
+CORE_OUT  = "linux_baseline_core_ticks.csv"
 MAX_SIM_SECONDS_MULT = 5
 PROGRESS_EVERY = 1000
 
@@ -39,6 +41,7 @@ print(f"📊 Loaded dataset: {len(df)} tasks, last arrival @ {last_arrival}s")
 arrivals = defaultdict(list)
 for _, row in df.iterrows():
     arrivals[int(row['Arrival_Sec'])].append(row)
+arrival_ticks = sorted(arrivals.keys())
 
 # 2) Initialize scheduler
 scheduler = LinuxBaselineScheduler(num_cores=4)   # tune cores if needed
@@ -68,6 +71,18 @@ while True:
             t = Task.from_row(row)
             scheduler.admit(t, current_time)
 
+    # Fast-forward over quiet ticks (no completion, quantum expiry or idle pick
+    # possible) up to the next arrival / progress print / max_ticks
+    jump_to = next_event_tick(arrival_ticks, current_time, scheduler,
+                              PROGRESS_EVERY, max_ticks)
+    if jump_to is not None:
+        scheduler.tick_advance(jump_to - current_time, current_time)
+        current_time = jump_to
+        if current_time > max_ticks:
+            print("⚠️ Reached safety max_ticks — stopping simulation to avoid runaway.")
+            break
+        continue
+
     # Run one tick
     scheduler.tick(current_time)
 
@@ -97,6 +112,10 @@ task_metrics_df = scheduler.export_task_metrics()
 task_metrics_df.to_csv(TASK_MET, index=False)
 print(f"📊 Per-task metrics saved to {TASK_MET} (rows: {len(task_metrics_df)})")
 
+# busy ticks per core: CPU utilization without relying on per-tick RUN rows
+scheduler.export_core_ticks().to_csv(CORE_OUT, index=False)
+print(f"🧮 Core busy ticks saved to {CORE_OUT}")
+
 # 6) Print aggregate metrics in table
 agg = scheduler.compute_aggregate_metrics()
 print("\n📈 Aggregate metrics (Linux Baseline):")
@@ -2,64 +2,85 @@
 # aggregate metrics
 #---------------------
 
+import argparse
+import os
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 
-# Load AI and Linux data
-ai_logs = pd.read_csv("ai_scheduler_logs.csv")
-ai_tasks = pd.read_csv("ai_scheduler_task_metrics.csv")
-linux_logs = pd.read_csv("linux_baseline_logs.csv")
-linux_tasks = pd.read_csv("linux_baseline_task_metrics.csv")
-
-# ---- AI Metrics ----
-def compute_metrics_ai(tasks: pd.DataFrame, logs: pd.DataFrame):
+# ---- Metrics (shared by AI and Linux runs) ----
+def compute_metrics(tasks: pd.DataFrame, logs: pd.DataFrame, core_ticks: pd.DataFrame = None):
     metrics = {}
     # From per-task metrics
     metrics["Avg Waiting Time"] = tasks["waiting"].mean()
     metrics["Avg Turnaround Time"] = tasks["turnaround"].mean()
     metrics["Avg Response Time"] = tasks["response"].mean()
-    metrics["Fairness (Jain Index)"] = (tasks["execution_time"].sum()**2) / (
-        len(tasks) * (np.sum(tasks["execution_time"]**2) + 1e-9)
-    )
-    # From logs
-    run_events = logs[logs["event"] == "RUN"]
-    total_run_time = len(run_events)
-    total_time = logs["time"].max() - logs["time"].min() + 1
+    execs = tasks["execution_time"].to_numpy()
+    exec_sum = execs.sum()
+    metrics["Fairness (Jain Index)"] = (exec_sum**2) / (len(tasks) * ((execs @ execs) + 1e-9))
+    # Busy ticks: the scheduler's per-core run counters when exported (counts
+    # work of unfinished tasks too), else RUN rows in the log. Last resort is
+    # the per-task execution_time sum, which only covers completed tasks and
+    # under-reports when the run stops with work still queued (e.g. max_ticks)
+    if core_ticks is not None:
+        total_run_time = int(core_ticks["run_ticks"].sum())
+    else:
+        run_count = int((logs["event"].to_numpy() == "RUN").sum())
+        total_run_time = run_count if run_count else exec_sum
+    times = logs["time"].to_numpy()
+    total_time = times.max() - times.min() + 1
     metrics["CPU Utilization (%)"] = 100 * total_run_time / (total_time * logs["core"].nunique())
     metrics["Throughput (tasks/unit time)"] = len(tasks) / total_time
     return metrics
 
-# ---- Linux Metrics ----
-def compute_metrics_linux(tasks: pd.DataFrame, logs: pd.DataFrame):
-    metrics = {}
-    metrics["Avg Waiting Time"] = tasks["waiting"].mean()
-    metrics["Avg Turnaround Time"] = tasks["turnaround"].mean()
-    metrics["Avg Response Time"] = tasks["response"].mean()
-    metrics["Fairness (Jain Index)"] = (tasks["execution_time"].sum()**2) / (
-        len(tasks) * (np.sum(tasks["execution_time"]**2) + 1e-9)
-    )
-    run_events = logs[logs["event"] == "RUN"]
-    total_run_time = len(run_events)
-    total_time = logs["time"].max() - logs["time"].min() + 1
-    metrics["CPU Utilization (%)"] = 100 * total_run_time / (total_time * logs["core"].nunique())
-    metrics["Throughput (tasks/unit time)"] = len(tasks) / total_time
-    return metrics
+# kept for existing callers; both schedulers export the same columns
+compute_metrics_ai = compute_metrics
+compute_metrics_linux = compute_metrics
+
+# ----------------------------------
+# Main CLI
+# ----------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Compare AI Scheduler vs Linux Baseline metrics")
+    parser.add_argument("--out", default="metrics_compare.png", help="Where to save the comparison plot")
+    parser.add_argument("--interactive", action="store_true", help="Show the plot window instead of saving it")
+    args = parser.parse_args()
+
+    # only the CLI plots; importing compute_metrics shouldn't pull in matplotlib
+    import matplotlib.pyplot as plt
+
+    # Load AI and Linux data
+    ai_logs = pd.read_csv("ai_scheduler_logs.csv")
+    ai_tasks = pd.read_csv("ai_scheduler_task_metrics.csv")
+    linux_logs = pd.read_csv("linux_baseline_logs.csv")
+    linux_tasks = pd.read_csv("linux_baseline_task_metrics.csv")
+
+    # per-core busy ticks written by the simulators (absent for older runs)
+    def read_core_ticks(path):
+        return pd.read_csv(path) if os.path.exists(path) else None
+
+    # Compute both
+    ai_metrics = compute_metrics(ai_tasks, ai_logs, read_core_ticks("ai_scheduler_core_ticks.csv"))
+    linux_metrics = compute_metrics(linux_tasks, linux_logs, read_core_ticks("linux_baseline_core_ticks.csv"))
+
+    # Compare side by side
+    comparison_df = pd.DataFrame([ai_metrics, linux_metrics], index=["AI Scheduler", "Linux Baseline"])
+    print("\n📊 Full Metrics Comparison:\n", comparison_df)
 
-# Compute both
-ai_metrics = compute_metrics_ai(ai_tasks, ai_logs)
-linux_metrics = compute_metrics_linux(linux_tasks, linux_logs)
+    # Plot numeric metrics
+    comparison_df.T.plot(kind="bar", figsize=(12,7))
+    plt.title("AI Scheduler vs Linux Baseline - Metrics Comparison")
+    plt.ylabel("Value")
+    plt.xticks(rotation=30, ha="right")
+    plt.legend(title="Scheduler")
+    plt.grid(axis="y", linestyle="--", alpha=0.6)
+    plt.tight_layout()
+    if args.interactive:
+        plt.show()
+    else:
+        plt.savefig(args.out, dpi=120)
+        print(f"✅ Saved {args.out}")
+    return ai_metrics, linux_metrics
 
-# Compare side by side
-comparison_df = pd.DataFrame([ai_metrics, linux_metrics], index=["AI Scheduler", "Linux Baseline"])
-print("\n📊 Full Metrics Comparison:\n", comparison_df)
 
-# Plot numeric metrics
-comparison_df.T.plot(kind="bar", figsize=(12,7))
-plt.title("AI Scheduler vs Linux Baseline - Metrics Comparison")
-plt.ylabel("Value")
-plt.xticks(rotation=30, ha="right")
-plt.legend(title="Scheduler")
-plt.grid(axis="y", linestyle="--", alpha=0.6)
-plt.tight_layout()
-plt.show()
+if __name__ == "__main__":
+    main()
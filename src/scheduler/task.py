@@ -1,12 +1,30 @@
 # ================================
 # PART 2: Task Class Definition
 # ================================
-import uuid
+import itertools
 import numpy as np
 
+# categorical feature encodings used by get_feature_vector
+POLICY_MAP = {"SCHED_OTHER": 0, "SCHED_FIFO": 1, "SCHED_RR": 2, "SCHED_IDLE": 3}
+STATE_MAP = {"RUNNING": 0, "SLEEPING": 1, "STOPPED": 2, "ZOMBIE": 3}
+
+# per-process task uid source (8 hex chars, like the old truncated uuid4)
+_UID_COUNTER = itertools.count()
+
 class Task:
     """Represents a process/task in our AI Scheduler."""
 
+    # fixed attribute layout (no per-instance __dict__); features stays the only dict
+    __slots__ = (
+        "features", "pid", "name", "total_time", "remaining", "arrival_time",
+        "resource_type", "interactivity", "priority_class", "execution_class",
+        "resource_num", "interactivity_num", "priority_num", "execution_num",
+        "subqueue_score", "assigned_scheduler", "subqueue",
+        "quantum", "total_run", "first_start", "completion_time",
+        "vruntime", "weight", "_cfs_gen", "last_core", "idx", "uid",
+        "sched_policy", "state", "_on_quantum_expire",
+    )
+
     def __init__(self, row):
         # --- Original features (dict for ML models) ---
         if hasattr(row, "to_dict"):
@@ -37,6 +55,11 @@ class Task:
         self.interactivity = None
         self.priority_class = None
         self.execution_class = None
+        # numeric form of the labels (set from the classifier LUTs)
+        self.resource_num = None
+        self.interactivity_num = None
+        self.priority_num = None
+        self.execution_num = None
 
         # --- Scheduling assignments ---
         self.subqueue_score = None
@@ -52,14 +75,35 @@ class Task:
         # --- CFS-specific ---
         self.vruntime = float(self.features.get("se.vruntime", 0))
         self.weight = float(self.features.get("se.load.weight", 1024))
+        self._cfs_gen = 0   # bumped on every CFS heap insert (lazy deletion)
 
         # --- Affinity ---
         self.last_core = None
 
+        # --- Index into the scheduler's task table (set on admission) ---
+        self.idx = None
+        self._on_quantum_expire = None   # scheduler-bound expiry handler (Linux baseline)
+
         # --- Logging ID (optional, unique) ---
-        self.uid = str(uuid.uuid4())[:8]
+        self.uid = f"{next(_UID_COUNTER):08x}"
+
+        # --- Raw fields kept after finalize_features() drops the dict ---
+        self.sched_policy = None
+        self.state = None
 
 
+    def finalize_features(self):
+        """
+        Drop the raw feature dict once admission/classification no longer needs it.
+        Keeps the few raw fields still worth having; everything else the scheduler
+        uses (remaining, arrival_time, vruntime, weight) is already an attribute.
+        """
+        if self.features is None:
+            return
+        self.sched_policy = self.features.get("Scheduling_Policy")
+        self.state = self.features.get("State")
+        self.features = None
+
     @classmethod
     def from_row(cls, row):
         # Accept Series or dict
@@ -68,41 +112,52 @@ class Task:
         else:
             return cls(row)
 
+    @classmethod
+    def from_arrays(cls, cols, idx):
+        # Build from column arrays (name -> ndarray) at row position idx
+        return cls({c: arr[idx] for c, arr in cols.items()})
+
     def get_feature_vector(self, category: str):
         """Return numpy array [1, n_features] in the right order."""
         if category == "resource":
-            feats_list = {f: self.features.get(f, 0) for f in resource_feats}
+            feats_list = resource_feats
         elif category == "interactivity":
-            feats_list = {f: self.features.get(f, 0) for f in interactivity_feats}
+            feats_list = interactivity_feats
         elif category == "priority":
-            feats_list = {f: self.features.get(f, 0) for f in priority_feats}
+            feats_list = priority_feats
         elif category == "execution":
-             feats_list = {f: self.features.get(f, 0) for f in execution_feats}
+            feats_list = execution_feats
         else:
             raise ValueError(f"Unknown feature category: {category}")
+        return self.get_feature_vector_all(feats_list).reshape(1, -1)  # keep 2D shape for sklearn
 
-        values = []
-        for f in feats_list:
-            val = self.features.get(f, 0)
+    def get_feature_vector_all(self, feats):
+        """Return 1-D numpy array over `feats` (union of all heads), extracted once."""
+        features = self.features
+        values = np.empty(len(feats))
+        for i, f in enumerate(feats):
+            val = features.get(f, 0)
 
             # Handle mappings
             if f == "Scheduling_Policy":
-                mapping = {"SCHED_OTHER": 0, "SCHED_FIFO": 1, "SCHED_RR": 2, "SCHED_IDLE": 3}
-                val_upper = str(val).upper() if val is not None else ""
-                val = mapping.get(val_upper, 0)
+                val = POLICY_MAP.get(str(val).upper() if val is not None else "", 0)
             elif f == "State":
-                mapping = {"RUNNING": 0, "SLEEPING": 1, "STOPPED": 2, "ZOMBIE": 3}
-                val_upper = str(val).upper() if val is not None else ""
-                val = mapping.get(val_upper, 0)
+                val = STATE_MAP.get(str(val).upper() if val is not None else "", 0)
             else:
                 try:
                     val = float(val)
                 except Exception:
                     val = 0.0
-
-            values.append(val)
-
-        return np.array([values])  # keep 2D shape for sklearn
+            values[i] = val
+        return values
+
+    @staticmethod
+    def stack_feature_matrix(tasks, feats):
+        """Return (len(tasks), len(feats)) float32 matrix, one feature row per task (batch predict input)."""
+        X = np.empty((len(tasks), len(feats)), dtype=np.float32)
+        for i, task in enumerate(tasks):
+            X[i] = task.get_feature_vector_all(feats)
+        return X
 
     def to_log_dict(self, current_time=None, state="READY"):
         """Return dict snapshot for logging."""
@@ -2,25 +2,9 @@
 # Utilities / helpers
 # --------------------
 def _log(self, event_type, task=None, core=None, extra=None):
-        row = {
-            "time": self.time,
-            "event": event_type,
-            "core": core,
-            "pid": getattr(task, "pid", None),
-            "name": getattr(task, "name", None),
-        }
-        if task is not None:
-            row.update({
-                "assigned_scheduler": task.assigned_scheduler,
-                "subqueue": task.subqueue,
-                "remaining": task.remaining,
-                "quantum": task.quantum,
-                "vruntime": getattr(task, "vruntime", None),
-                "subqueue_score": getattr(task, "subqueue_score", None),
-            })
-        if extra:
-            row.update(extra)
-        self.logs.append(row)
+        # self.logs is an event_log.LogBuffer (one typed column per field);
+        # export with self.logs.to_frame()
+        self.logs.append(self.time, event_type, core, getattr(task, "pid", None), task, extra)
 
 def all_queues_empty(self):
         # check both queue structures and running cores
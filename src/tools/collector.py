@@ -6,34 +6,172 @@ Collect per-process Linux PCB-style features into a CSV.
 
 Usage:
 sudo python3 collector.py --interval 1.0 --out linux_dataset.csv
+(add --with-cmdline to fill the Cmdline column; --format jsonl|feather
+for line-delimited JSON or a Feather v2 file instead of CSV; read the
+latter with pd.read_feather once the collector has stopped)
 """
 
-import psutil, time, csv, os, argparse
+import psutil, time, csv, os, argparse, functools
+from concurrent.futures import ThreadPoolExecutor
+from collections import namedtuple
+from dataclasses import dataclass
 from datetime import datetime
 
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+BOOT_TIME = psutil.boot_time()
+
+# /proc/<pid>/stat state letter -> psutil-style status string
+STATUS_NAMES = {
+    "R": "running", "S": "sleeping", "D": "disk-sleep", "T": "stopped",
+    "t": "tracing-stop", "Z": "zombie", "X": "dead", "x": "dead",
+    "K": "wake-kill", "W": "waking", "P": "parked", "I": "idle",
+}
+
+# pid -> (starttime, cpu ticks, monotonic time) from the previous sample,
+# for psutil-compatible cpu_percent without keeping Process objects
+_CPU_PREV = {}
+
+# per-PID cache of what's derived from a process's comm/cmdline. pid+starttime
+# pins the process (a recycled PID gets a new starttime); comm is re-checked
+# every sample since execve()/prctl(PR_SET_NAME) change it under the same
+# pid (kworkers rename themselves constantly)
+@dataclass(slots=True)
+class StaticInfo:
+    starttime: int      # ticks since boot, stat field 22
+    create_time: float  # epoch seconds
+    comm: str = None    # comm that name/cmdline were derived from
+    name: str = ""      # comm, or the cmdline basename for a truncated comm
+    cmdline: str = ""
+
+
+_STATIC = {}
+
+
+# /proc/<pid>/sched keys kept in the dataset, in SchedFields slot order
+SCHED_KEYS = (
+    "se.exec_start", "se.vruntime", "se.sum_exec_runtime",
+    "nr_switches", "nr_voluntary_switches",
+    "nr_involuntary_switches", "se.load.weight"
+)
+SCHED_SLOT = {k: i for i, k in enumerate(SCHED_KEYS)}
+SchedFields = namedtuple("SchedFields", [
+    "exec_start", "vruntime", "sum_exec_runtime",
+    "nr_switches", "nr_vol", "nr_invol", "load_weight"
+])
+EMPTY_SCHED = SchedFields(*[None] * len(SCHED_KEYS))
+
 
 def read_proc_sched(pid):
     path = f"/proc/{pid}/sched"
-    d = {}
+    vals = [None] * len(SCHED_KEYS)
     try:
         with open(path, "r") as f:
-            for line in f:
-                parts = line.strip().split(":")
-                if len(parts) != 2:
-                    continue
-                key, val = parts
-                key = key.strip().replace(" ", "_")
-                val = val.strip().split()[0]
-                # select only a few keys
-                if key in [
-                    "se.exec_start", "se.vruntime", "se.sum_exec_runtime",
-                    "nr_switches", "nr_voluntary_switches",
-                    "nr_involuntary_switches", "se.load.weight"
-                ]:
-                    d[key] = val
-        return d
+            data = f.read()
+        # one bulk read; only the few keep-set lines get their value split
+        for line in data.split("\n"):
+            idx = line.find(":")
+            if idx < 0:
+                continue
+            slot = SCHED_SLOT.get(line[:idx].strip().replace(" ", "_"))
+            if slot is not None:
+                vals[slot] = line[idx + 1:].split(None, 1)[0]
+        return SchedFields(*vals)
     except Exception:
-        return {}
+        return EMPTY_SCHED
+
+
+def read_stat(pid):
+    # single read of /proc/<pid>/stat; fields are split after the last ')'
+    # so a comm with spaces/parens doesn't shift the indices
+    with open(f"/proc/{pid}/stat", "rb") as f:
+        buf = f.read()
+    rpar = buf.rindex(b")")
+    parts = buf[rpar + 2:].split()
+    # parts[0] is field 3 (state), so field n lives at parts[n - 3]
+    return {
+        "comm": buf[buf.index(b"(") + 1:rpar].decode(errors="replace"),  # 2
+        "state": parts[0].decode(),     # 3
+        "ppid": int(parts[1]),          # 4
+        "utime": int(parts[11]),        # 14
+        "stime": int(parts[12]),        # 15
+        "priority": int(parts[15]),     # 18
+        "nice": int(parts[16]),         # 19
+        "num_threads": int(parts[17]),  # 20
+        "starttime": int(parts[19]),    # 22, ticks since boot
+        "vsize": int(parts[20]),        # 23, bytes
+        "rss": int(parts[21]),          # 24, pages
+    }
+
+
+def read_status_ctxt(pid):
+    # (voluntary, nonvoluntary) context switches from /proc/<pid>/status
+    vol = invol = 0
+    with open(f"/proc/{pid}/status", "rb") as f:
+        for line in f:
+            if line.startswith(b"voluntary_ctxt_switches:"):
+                vol = int(line.split()[1])
+            elif line.startswith(b"nonvoluntary_ctxt_switches:"):
+                invol = int(line.split()[1])
+    return vol, invol
+
+
+def read_io(pid):
+    # /proc/<pid>/io; needs ptrace access (same user or root), like psutil
+    d = {}
+    with open(f"/proc/{pid}/io", "rb") as f:
+        for line in f:
+            key, _, val = line.partition(b":")
+            d[key] = int(val)
+    return d[b"read_bytes"], d[b"write_bytes"], d[b"syscr"], d[b"syscw"]
+
+
+def read_cmdline(pid):
+    with open(f"/proc/{pid}/cmdline", "rb") as f:
+        data = f.read()
+    return [a.decode(errors="replace") for a in data.rstrip(b"\0").split(b"\0")] if data else []
+
+
+def get_static(pid, st, clock_ticks, with_cmdline):
+    comm = st["comm"]
+    info = _STATIC.get(pid)
+    if info is None or info.starttime != st["starttime"]:
+        info = _STATIC[pid] = StaticInfo(
+            starttime=st["starttime"],
+            create_time=BOOT_TIME + st["starttime"] / clock_ticks,
+        )
+    if info.comm != comm:
+        # cmdline is only needed for the Cmdline column or to un-truncate a
+        # 15-char comm (psutil swaps in the cmdline basename)
+        parts = read_cmdline(pid) if with_cmdline or len(comm) >= 15 else []
+        name = comm
+        if len(comm) >= 15 and parts:
+            extended = os.path.basename(parts[0])
+            if extended.startswith(comm):
+                name = extended
+        # an exec changes comm too, so the argv is re-read along with it
+        info.cmdline = " ".join(parts) if with_cmdline else ""
+        info.comm = comm
+        info.name = name
+    return info
+
+
+def iter_pids():
+    # numeric /proc entries only; no psutil.Process object per PID
+    with os.scandir("/proc") as it:
+        for entry in it:
+            if entry.name.isdigit():
+                yield int(entry.name)
+
+
+def cpu_percent(pid, st, clock_ticks, t_mono):
+    # same value as psutil's Process.cpu_percent(interval=None): 0.0 on the
+    # first sight of a process, then % of one CPU since the previous sample
+    ticks = st["utime"] + st["stime"]
+    prev = _CPU_PREV.get(pid)
+    _CPU_PREV[pid] = (st["starttime"], ticks, t_mono)
+    if prev is None or prev[0] != st["starttime"] or t_mono <= prev[2]:
+        return 0.0
+    return round((ticks - prev[1]) / clock_ticks / (t_mono - prev[2]) * 100, 1)
 
 
 def get_sched_policy(pid):
@@ -48,142 +186,230 @@ def get_sched_policy(pid):
         return ""
 
 
-def sample_once(clock_ticks):
-    rows = []
-    now = datetime.now().isoformat()
-    for p in psutil.process_iter(['pid', 'name', 'ppid', 'num_threads',
-                                  'status', 'cmdline']):
-        try:
-            pid = p.info['pid']
-            pname = p.info.get('name') or ""
-            pppid = p.info.get('ppid') or -1
-            threads = p.info.get('num_threads') or 0
-            state = p.info.get('status') or ""
-            cmdline = " ".join(p.info.get('cmdline') or [])
-
-            # memory
-            mem_info = p.memory_info()
-            vmrss = int(mem_info.rss / 1024)
-            vmsize = int(mem_info.vms / 1024)
-
-            # cpu
-            cpu_pct = p.cpu_percent(interval=None)
-            t = p.cpu_times()
-            total_time_ticks = int((t.user + t.system) * clock_ticks)
-            elapsed = time.time() - p.create_time()
-
-            # context switches
-            cs = p.num_ctx_switches()
-            vol = cs.voluntary
-            invol = cs.involuntary
-
-            # nice/priority
-            nice = p.nice()
-            # priority from /proc/<pid>/stat
-            prio = None
-            try:
-                with open(f"/proc/{pid}/stat") as f:
-                    parts = f.read().split()
-                    prio = int(parts[17])  # field 18 = priority
-            except:
-                pass
-
-            # scheduling policy
-            sched_pol = get_sched_policy(pid)
-
-            # sched stats
-            schedstats = read_proc_sched(pid)
-
-            # io
-            io = p.io_counters()
-            read_bytes = io.read_bytes
-            write_bytes = io.write_bytes
-            read_count = io.read_count
-            write_count = io.write_count
-
-            row = {
-                "Timestamp": now,
-                "PID": pid,
-                "Name": pname,
-                "Cmdline": cmdline,
-                "PPid": pppid,
-                "State": state,
-                "Threads": threads,
-                "Priority": prio,
-                "Nice": nice,
-                "Scheduling_Policy": sched_pol,
-                "CPU_Usage_%": cpu_pct,
-                "Total_Time_Ticks": total_time_ticks,
-                "Elapsed_Time_sec": elapsed,
-                "VmRSS": vmrss,
-                "VmSize": vmsize,
-                "Voluntary_ctxt_switches": vol,
-                "Nonvoluntary_ctxt_switches": invol,
-                "IO_Read_Bytes": read_bytes,
-                "IO_Write_Bytes": write_bytes,
-                "IO_Read_Count": read_count,
-                "IO_Write_Count": write_count,
-                # sched stats
-                "se.exec_start": schedstats.get("se.exec_start"),
-                "se.vruntime": schedstats.get("se.vruntime"),
-                "se.sum_exec_runtime": schedstats.get("se.sum_exec_runtime"),
-                "nr_switches": schedstats.get("nr_switches"),
-                "nr_voluntary_switches": schedstats.get("nr_voluntary_switches"),
-                "nr_involuntary_switches": schedstats.get("nr_involuntary_switches"),
-                "se.load.weight": schedstats.get("se.load.weight"),
-            }
-            rows.append(row)
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
+def collect_one(pid, now, clock_ticks, t_mono, t_now, with_cmdline=False):
+    """One CSV row for `pid`, or None if it exited / isn't readable."""
+    try:
+        # utime/stime, prio, nice, start time and memory from one stat read
+        st = read_stat(pid)
+        vol, invol = read_status_ctxt(pid)
+        read_bytes, write_bytes, read_count, write_count = read_io(pid)
+        static = get_static(pid, st, clock_ticks, with_cmdline)
+    except (FileNotFoundError, ProcessLookupError, PermissionError):
+        # exited mid-read, or not ours to inspect (psutil's NoSuchProcess/AccessDenied)
+        return None
+
+    pname = static.name
+    pppid = st["ppid"] or -1
+    threads = st["num_threads"]
+    state = STATUS_NAMES.get(st["state"], "?")
+    cmdline = static.cmdline
+
+    vmrss = int(st["rss"] * PAGE_SIZE / 1024)
+    vmsize = int(st["vsize"] / 1024)
+    cpu_pct = cpu_percent(pid, st, clock_ticks, t_mono)
+    total_time_ticks = st["utime"] + st["stime"]
+    elapsed = t_now - static.create_time
+    nice = st["nice"]
+    prio = st["priority"]
+
+    # scheduling policy
+    sched_pol = get_sched_policy(pid)
+
+    # sched stats
+    schedstats = read_proc_sched(pid)
+
+    row = {
+        "Timestamp": now,
+        "PID": pid,
+        "Name": pname,
+        "Cmdline": cmdline,
+        "PPid": pppid,
+        "State": state,
+        "Threads": threads,
+        "Priority": prio,
+        "Nice": nice,
+        "Scheduling_Policy": sched_pol,
+        "CPU_Usage_%": cpu_pct,
+        "Total_Time_Ticks": total_time_ticks,
+        "Elapsed_Time_sec": elapsed,
+        "VmRSS": vmrss,
+        "VmSize": vmsize,
+        "Voluntary_ctxt_switches": vol,
+        "Nonvoluntary_ctxt_switches": invol,
+        "IO_Read_Bytes": read_bytes,
+        "IO_Write_Bytes": write_bytes,
+        "IO_Read_Count": read_count,
+        "IO_Write_Count": write_count,
+        # sched stats
+        "se.exec_start": schedstats.exec_start,
+        "se.vruntime": schedstats.vruntime,
+        "se.sum_exec_runtime": schedstats.sum_exec_runtime,
+        "nr_switches": schedstats.nr_switches,
+        "nr_voluntary_switches": schedstats.nr_vol,
+        "nr_involuntary_switches": schedstats.nr_invol,
+        "se.load.weight": schedstats.load_weight,
+    }
+    return row
+
+
+def sample_once(clock_ticks, executor=None, with_cmdline=False):
+    # one clock read per sample: every row shares the timestamp string and
+    # the wall/monotonic "now" used for elapsed time and cpu_percent
+    t_now = time.time()
+    t_mono = time.monotonic()
+    now = datetime.fromtimestamp(t_now).isoformat()
+    collect = functools.partial(collect_one, now=now, clock_ticks=clock_ticks, t_mono=t_mono,
+                                t_now=t_now, with_cmdline=with_cmdline)
+    # /proc reads release the GIL, so a thread pool overlaps the per-PID syscalls
+    results = executor.map(collect, iter_pids()) if executor else map(collect, iter_pids())
+    rows = [r for r in results if r is not None]
+
+    # forget exited PIDs so a recycled PID starts fresh
+    live = {r["PID"] for r in rows}
+    for pid in _CPU_PREV.keys() - live:
+        del _CPU_PREV[pid]
+    for pid in _STATIC.keys() - live:
+        del _STATIC[pid]
     return rows
 
 
+FIELDNAMES = [
+    "Timestamp", "PID", "Name", "Cmdline", "PPid",
+    "State", "Threads", "Priority", "Nice", "Scheduling_Policy",
+    "CPU_Usage_%", "Total_Time_Ticks", "Elapsed_Time_sec",
+    "VmRSS", "VmSize",
+    "Voluntary_ctxt_switches", "Nonvoluntary_ctxt_switches",
+    "IO_Read_Bytes", "IO_Write_Bytes", "IO_Read_Count", "IO_Write_Count",
+    "se.exec_start", "se.vruntime", "se.sum_exec_runtime",
+    "nr_switches", "nr_voluntary_switches", "nr_involuntary_switches",
+    "se.load.weight"
+]
+# column types for the Arrow schema; everything else (incl. the raw
+# /proc/<pid>/sched values) is a string
+FLOAT_FIELDS = {"CPU_Usage_%", "Elapsed_Time_sec"}
+INT_FIELDS = {
+    "PID", "PPid", "Threads", "Priority", "Nice", "Total_Time_Ticks",
+    "VmRSS", "VmSize", "Voluntary_ctxt_switches", "Nonvoluntary_ctxt_switches",
+    "IO_Read_Bytes", "IO_Write_Bytes", "IO_Read_Count", "IO_Write_Count",
+}
+
+
+class CsvSink:
+    """Appends to a CSV (header written only for a new file)."""
+
+    def __init__(self, path):
+        new = not os.path.exists(path)
+        # keep the output open across samples; flush once per batch
+        self.f = open(path, "a", newline='', buffering=1 << 20)
+        self.writer = csv.DictWriter(self.f, fieldnames=FIELDNAMES)
+        if new:
+            self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+class JsonlSink:
+    """One JSON object per row, appended; uses orjson when installed."""
+
+    def __init__(self, path):
+        try:
+            import orjson
+            self.dumps = orjson.dumps
+        except ImportError:
+            import json
+            self.dumps = lambda r: json.dumps(r).encode()
+        self.f = open(path, "ab", buffering=1 << 20)
+
+    def write(self, rows):
+        dumps = self.dumps
+        self.f.write(b"".join(dumps(r) + b"\n" for r in rows))
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+class FeatherSink:
+    """Feather v2 (Arrow IPC file), one record batch per sample (needs pyarrow).
+
+    The footer is written on close(), so the file is only readable with
+    pd.read_feather / pyarrow.feather.read_table after the collector stops.
+    """
+
+    def __init__(self, path):
+        import pyarrow as pa
+        if os.path.exists(path):
+            # an IPC file has a single footer, so a second run can't append to it
+            raise SystemExit(f"{path} exists; Feather files can't be appended to")
+        self.pa = pa
+        self.schema = pa.schema([
+            (c, pa.float64() if c in FLOAT_FIELDS else pa.int64() if c in INT_FIELDS else pa.string())
+            for c in FIELDNAMES
+        ])
+        self.f = pa.OSFile(path, "wb")
+        self.writer = pa.ipc.new_file(self.f, self.schema)
+
+    def write(self, rows):
+        if rows:
+            self.writer.write_table(self.pa.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+        self.f.close()
+
+
+SINKS = {"csv": CsvSink, "jsonl": JsonlSink, "feather": FeatherSink}
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--interval", type=float, default=1.0,
                         help="sampling interval seconds")
     parser.add_argument("--out", type=str, default="linux_dataset.csv")
+    parser.add_argument("--workers", type=int, default=min(8, os.cpu_count() or 1),
+                        help="threads reading /proc per sample (<=1 = serial)")
+    parser.add_argument("--format", choices=sorted(SINKS), default="csv",
+                        help="output encoding (feather = Feather v2 / Arrow IPC file)")
+    parser.add_argument("--with-cmdline", action="store_true",
+                        help="fill the Cmdline column (left empty by default)")
     args = parser.parse_args()
 
     clock_ticks = os.sysconf(os.sysconf_names['SC_CLK_TCK'])
 
-    fieldnames = [
-        "Timestamp", "PID", "Name", "Cmdline", "PPid",
-        "State", "Threads", "Priority", "Nice", "Scheduling_Policy",
-        "CPU_Usage_%", "Total_Time_Ticks", "Elapsed_Time_sec",
-        "VmRSS", "VmSize",
-        "Voluntary_ctxt_switches", "Nonvoluntary_ctxt_switches",
-        "IO_Read_Bytes", "IO_Write_Bytes", "IO_Read_Count", "IO_Write_Count",
-        "se.exec_start", "se.vruntime", "se.sum_exec_runtime",
-        "nr_switches", "nr_voluntary_switches", "nr_involuntary_switches",
-        "se.load.weight"
-    ]
-
-    # create file with header if not exists
-    if not os.path.exists(args.out):
-        with open(args.out, "w", newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+    try:
+        sink = SINKS[args.format](args.out)
+    except ImportError as e:
+        parser.error(f"--format {args.format} needs {e.name} (pip install {e.name})")
 
     print(f"Starting collector. Writing to {args.out}. Press Ctrl-C to stop.")
     # warmup cpu_percent
-    for p in psutil.process_iter():
+    t_mono = time.monotonic()
+    for pid in iter_pids():
         try:
-            p.cpu_percent(interval=None)
-        except:
+            cpu_percent(pid, read_stat(pid), clock_ticks, t_mono)
+        except OSError:
             pass
 
+    executor = ThreadPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
     try:
         while True:
-            rows = sample_once(clock_ticks)
-            with open(args.out, "a", newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                for r in rows:
-                    writer.writerow(r)
-            print(f"{datetime.now().isoformat()} wrote {len(rows)} rows")
-            time.sleep(args.interval)
+            start = time.monotonic()
+            rows = sample_once(clock_ticks, executor, args.with_cmdline)
+            sink.write(rows)
+            print(f"{rows[0]['Timestamp'] if rows else datetime.now().isoformat()} wrote {len(rows)} rows")
+            # sleep out the rest of the interval so sampling time doesn't drift the rate
+            time.sleep(max(0.0, args.interval - (time.monotonic() - start)))
     except KeyboardInterrupt:
         print("Stopping collector.")
+    finally:
+        sink.close()
+        if executor:
+            executor.shutdown()
 
 
 if __name__ == "__main__":
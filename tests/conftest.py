@@ -0,0 +1,45 @@
+import pytest
+
+
+def _old_log_row(time, event, core=None, task=None, extra=None):
+    """Row exactly as the old list-of-dicts _log built it."""
+    row = {
+        "time": time,
+        "event": event,
+        "core": core,
+        "pid": getattr(task, "pid", None),
+        "name": getattr(task, "name", None),
+    }
+    if task is not None:
+        row.update({
+            "assigned_scheduler": task.assigned_scheduler,
+            "subqueue": task.subqueue,
+            "remaining": task.remaining,
+            "quantum": task.quantum,
+            "vruntime": getattr(task, "vruntime", None),
+            "subqueue_score": getattr(task, "subqueue_score", None),
+        })
+    if extra:
+        row.update(extra)
+    return row
+
+
+@pytest.fixture
+def old_log_row():
+    return _old_log_row
+
+
+@pytest.fixture
+def record_old_log():
+    """Wrap a scheduler's _log so every event is also kept as an old-style dict row."""
+    def record(sched):
+        rows = []
+        log = sched._log
+
+        def both(event_type, task=None, core=None, extra=None):
+            rows.append(_old_log_row(sched.time, event_type, core, task, extra))
+            log(event_type, task, core, extra)
+
+        sched._log = both
+        return rows
+    return record
@@ -0,0 +1,236 @@
+import json
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import LabelEncoder
+
+from src.scheduler import ai_scheduler
+from src.scheduler.ai_scheduler import AIScheduler
+from src.scheduler.fast_forward import next_event_tick
+from src.scheduler.task import Task
+
+FEATURES = {
+    "resource": ["CPU_Usage_%", "Threads"],
+    "interactivity": ["Nice", "State", "Threads"],
+    "priority": ["Nice", "Scheduling_Policy"],
+    "execution": ["Total_Time_Ticks", "Threads"],
+}
+LABELS = {
+    "resource": ["CPU-bound", "IO-bound", "Mixed"],
+    "interactivity": ["Background", "Batch", "Interactive", "Other", "Real-time"],
+    "priority": ["High", "Low", "Medium"],
+    "execution": ["Long", "Medium", "Short"],
+}
+
+
+class CodeModel:
+    """Predicts a class code from one feature column; fitted names like an sklearn model."""
+
+    def __init__(self, kind, column, n_classes, as_label=None, names=None):
+        self.feature_names_in_ = np.array(names or FEATURES[kind], dtype=object)
+        self.col = list(self.feature_names_in_).index(column)
+        self.n = n_classes
+        self.as_label = as_label   # predict label strings instead of codes
+        self.inputs = []           # type of every X passed to predict
+
+    def predict(self, X):
+        self.inputs.append(type(X))
+        if hasattr(X, "columns") and list(X.columns) != list(self.feature_names_in_):
+            raise ValueError("feature names should match those that were passed during fit")
+        codes = np.asarray(X)[:, self.col].astype(int) % self.n
+        if self.as_label is not None:
+            return np.asarray(self.as_label)[codes]
+        return codes
+
+
+@pytest.fixture
+def make_scheduler(tmp_path, monkeypatch):
+    # feature lists are read from <kind>_features.json in the cwd (cached per process)
+    for kind, feats in FEATURES.items():
+        (tmp_path / f"{kind}_features.json").write_text(json.dumps(feats))
+    monkeypatch.chdir(tmp_path)
+    ai_scheduler._load_feature_list.cache_clear()
+    encoders = {k: LabelEncoder().fit(v) for k, v in LABELS.items()}
+
+    def make(string_priority=True, models=None, **kw):
+        models = {
+            "resource": CodeModel("resource", "Threads", 3),
+            "interactivity": CodeModel("interactivity", "Nice", 5),
+            # string-label head, like the RF models: decoding falls back to the default
+            "priority": CodeModel("priority", "Nice", 3,
+                                  as_label=LABELS["priority"] if string_priority else None),
+            "execution": CodeModel("execution", "Total_Time_Ticks", 3),
+            **(models or {}),
+        }
+        return AIScheduler(models=models, encoders=encoders, **kw)
+
+    yield make
+    ai_scheduler._load_feature_list.cache_clear()
+
+
+def _workload(n=40, seed=2):
+    rng = random.Random(seed)
+    rows = []
+    for pid in range(1, n + 1):
+        rows.append({
+            "PID": pid, "Name": f"p{pid}",
+            "Arrival_Sec": rng.randint(0, 200),
+            "Total_Time_Ticks": rng.randint(1, 300),
+            "Scheduling_Policy": rng.choice(["SCHED_OTHER", "SCHED_OTHER", "SCHED_FIFO",
+                                             "SCHED_RR", "SCHED_IDLE"]),
+            "State": rng.choice(["running", "sleeping"]),
+            "CPU_Usage_%": rng.random() * 100,
+            "Nice": rng.randint(-5, 5),
+            "Threads": rng.randint(1, 8),
+            "se.vruntime": rng.random() * 50,
+            "se.load.weight": rng.choice([1024, 335, 3121]),
+        })
+    return rows
+
+
+LABEL_ATTRS = ("resource_type", "interactivity", "priority_class", "execution_class",
+               "resource_num", "interactivity_num", "priority_num", "execution_num",
+               "subqueue_score")
+
+
+@pytest.mark.parametrize("string_priority", [False, True])
+def test_classify_many_matches_single_task_path(make_scheduler, string_priority):
+    """The batched classifier sets the same labels, numeric labels and scores."""
+    sched = make_scheduler(string_priority)
+    rows = _workload()
+    single = [Task.from_row(r) for r in rows]
+    for t in single:
+        sched._classify_task(t)
+        sched._compute_subqueue_score(t)
+    batch = [Task.from_row(r) for r in rows]
+    sched.classify_many(batch)
+    for t in batch:
+        # a fallen-back head leaves scoring to admit(), as here
+        if t.subqueue_score is None:
+            sched._compute_subqueue_score(t)
+    for a, b in zip(single, batch):
+        for attr in LABEL_ATTRS:
+            assert getattr(a, attr) == getattr(b, attr), attr
+    assert {t.interactivity for t in batch} > {"Other"}
+    if string_priority:
+        # the string-label head fell back to its default label
+        assert {t.priority_class for t in batch} == {"Medium"}
+    else:
+        assert len({t.priority_class for t in batch}) == 3
+
+
+def test_admit_batch_matches_admit(make_scheduler):
+    rows = _workload()
+    one, many = make_scheduler(), make_scheduler()
+    for r in rows:
+        one.admit(Task.from_row(r), 0)
+    many.admit_batch([Task.from_row(r) for r in rows], 0)
+    assert one.export_logs().to_csv(index=False) == many.export_logs().to_csv(index=False)
+    for pid, t in one.task_map.items():
+        u = many.task_map[pid]
+        assert (t.assigned_scheduler, t.subqueue, t.quantum) == (u.assigned_scheduler, u.subqueue, u.quantum)
+
+
+def test_predict_uses_ndarrays_after_name_check(make_scheduler):
+    """Heads fitted on the feature list get plain arrays; a name mismatch still fails."""
+    reordered = CodeModel("execution", "Threads", 3, names=["Threads", "Total_Time_Ticks"])
+    sched = make_scheduler(models={"execution": reordered})
+    tasks = [Task.from_row(r) for r in _workload(n=5)]
+    sched.classify_many(tasks[:3])
+    sched._classify_task(tasks[3])
+    assert set(sched.models["resource"].inputs) == {np.ndarray}
+    assert set(reordered.inputs) == {pd.DataFrame}
+    assert {t.execution_class for t in tasks[:4]} == {"Medium"}   # fallback label
+
+
+def test_decode_rejects_out_of_range_codes(make_scheduler):
+    sched = make_scheduler()
+    assert list(sched._decode("execution", [0, 2])) == ["Long", "Short"]
+    for bad in ([3], [-1], ["Short"]):
+        with pytest.raises(ValueError):
+            sched._decode("execution", bad)
+        assert sched._numeric("execution", bad) is None
+
+
+def test_cfs_reinsert_leaves_tombstone(make_scheduler):
+    """Re-inserting a queued CFS task bumps its generation; the old entry is skipped on pop."""
+    sched = make_scheduler()
+    task = Task.from_row({"PID": 1, "Total_Time_Ticks": 10, "se.vruntime": 5.0})
+    task.assigned_scheduler, task.subqueue = "CFS", "cfs_1"
+    task.idx = 0
+    sched.tasks.append(task)
+    sched._cfs_insert("cfs_1", task)
+    task.vruntime = 1.0
+    sched._cfs_insert("cfs_1", task)
+    assert len(sched.queues["CFS"]["cfs_1"]) == 2
+    assert sched.heads["CFS"] == ("cfs_1", task)
+    assert sched._cfs_pop_min("cfs_1") is task
+    # only the stale (gen 1) entry is left, so the queue reads as empty
+    assert sched._cfs_pop_min("cfs_1") is None
+    assert sched.heads["CFS"] is None
+    assert sched.cfs_total_weight == 0.0
+
+
+def _run(sched, rows, fast_forward, max_ticks=20000, progress_every=1000):
+    by_tick = {}
+    for r in rows:
+        by_tick.setdefault(r["Arrival_Sec"], []).append(r)
+    arrival_ticks = sorted(by_tick)
+    current_time = 0
+    while True:
+        if current_time in by_tick:
+            sched.admit_batch([Task.from_row(r) for r in by_tick[current_time]], current_time)
+        if fast_forward:
+            jump_to = next_event_tick(arrival_ticks, current_time, sched,
+                                      progress_every, max_ticks)
+            if jump_to is not None:
+                sched.tick_advance(jump_to - current_time, current_time)
+                current_time = jump_to
+                continue
+        sched.tick(current_time)
+        if current_time > arrival_ticks[-1] and sched.all_queues_empty():
+            break
+        current_time += 1
+    return current_time
+
+
+@pytest.mark.parametrize("log_runs", [False, True])
+def test_fast_forward_matches_tick_by_tick(make_scheduler, log_runs):
+    rows = _workload()
+    slow, fast = make_scheduler(log_runs=log_runs), make_scheduler(log_runs=log_runs)
+    stepped = []
+    tick = fast.tick
+    fast.tick = lambda t=None: (stepped.append(t), tick(t))[1]
+    end = _run(slow, rows, False)
+    assert _run(fast, rows, True) == end
+    assert len(stepped) < end / 2   # the quiet spans really were skipped
+    assert len(slow.completed_tasks) == len(rows)
+    assert fast.export_logs().to_csv(index=False) == slow.export_logs().to_csv(index=False)
+    assert (fast.export_task_metrics().to_csv(index=False)
+            == slow.export_task_metrics().to_csv(index=False))
+    assert fast.export_core_ticks().equals(slow.export_core_ticks())
+
+
+def test_run_rows_logged_by_default(make_scheduler):
+    """RUN rows are on by default (like the Linux baseline) and match the core busy ticks."""
+    sched = make_scheduler()
+    _run(sched, _workload(), True)
+    logs = sched.export_logs()
+    per_core = logs[logs["event"] == "RUN"].groupby("core").size()
+    ticks = sched.export_core_ticks().set_index("core")["run_ticks"]
+    assert per_core.sum() > 0
+    assert (per_core.reindex(ticks.index, fill_value=0).to_numpy() == ticks.to_numpy()).all()
+    quiet = make_scheduler(log_runs=False)
+    _run(quiet, _workload(), True)
+    assert not (quiet.export_logs()["event"] == "RUN").any()
+
+
+def test_logs_match_list_of_dicts_frame(make_scheduler, record_old_log):
+    """Every event _log writes to the LogBuffer exports like the old list of dict rows."""
+    sched = make_scheduler()
+    old = record_old_log(sched)
+    _run(sched, _workload(), False)
+    assert {e for e in sched.export_logs()["event"]} >= {"ADMIT", "DISPATCH", "RUN", "PREEMPT", "COMPLETE"}
+    assert sched.export_logs().to_csv(index=False) == pd.DataFrame(old).to_csv(index=False)
@@ -0,0 +1,148 @@
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import psutil
+import pytest
+
+from src.tools import collector
+
+PID = os.getpid()
+CLOCK_TICKS = os.sysconf(os.sysconf_names["SC_CLK_TCK"])
+
+
+def test_read_stat_matches_psutil():
+    st = collector.read_stat(PID)
+    proc = psutil.Process(PID)
+    assert st["comm"] == proc.name()[:15]
+    assert st["ppid"] == proc.ppid()
+    assert st["nice"] == proc.nice()
+    assert st["num_threads"] == proc.num_threads()
+    assert collector.STATUS_NAMES[st["state"]] == proc.status()
+    assert st["vsize"] // 1024 == proc.memory_info().vms // 1024
+    create = collector.BOOT_TIME + st["starttime"] / CLOCK_TICKS
+    assert create == pytest.approx(proc.create_time(), abs=0.05)
+
+
+def test_read_stat_comm_with_spaces_and_parens():
+    """Fields are located after the last ')', so an odd comm can't shift them."""
+    code = ("import ctypes, time; ctypes.CDLL(None).prctl(15, b'a) b (c', 0, 0, 0); "
+            "print(flush=True); time.sleep(30)")
+    child = subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE)
+    try:
+        child.stdout.readline()   # renamed
+        st = collector.read_stat(child.pid)
+        assert st["comm"] == "a) b (c"
+        assert st["ppid"] == PID
+        assert st["state"] in "SR"
+    finally:
+        child.kill()
+        child.wait()
+
+
+def test_status_io_and_cmdline_match_psutil():
+    proc = psutil.Process(PID)
+    vol, invol = collector.read_status_ctxt(PID)
+    ctx = proc.num_ctx_switches()
+    # the counters only grow; psutil reads after us
+    assert 0 < vol <= ctx.voluntary and invol <= ctx.involuntary
+    read_bytes, write_bytes, syscr, syscw = collector.read_io(PID)
+    io = proc.io_counters()
+    assert read_bytes <= io.read_bytes and syscr <= io.read_count
+    assert collector.read_cmdline(PID) == proc.cmdline()
+    assert PID in set(collector.iter_pids())
+
+
+def test_read_proc_sched():
+    if not os.path.exists(f"/proc/{PID}/sched"):
+        pytest.skip("kernel without /proc/<pid>/sched")
+    fields = collector.read_proc_sched(PID)
+    assert isinstance(fields, collector.SchedFields)
+    assert int(fields.nr_switches) == int(fields.nr_vol) + int(fields.nr_invol)
+    assert float(fields.sum_exec_runtime) > 0
+    # unreadable pid -> all-None fields rather than an exception
+    assert collector.read_proc_sched(-1) == collector.EMPTY_SCHED
+
+
+def test_get_static_follows_comm_and_starttime():
+    collector._STATIC.pop(PID, None)
+    st = collector.read_stat(PID)
+    info = collector.get_static(PID, st, CLOCK_TICKS, with_cmdline=True)
+    assert info.name == st["comm"]
+    assert info.cmdline == " ".join(psutil.Process(PID).cmdline())
+    # prctl(PR_SET_NAME) / exec: same pid and starttime, new comm
+    info = collector.get_static(PID, dict(st, comm="renamed"), CLOCK_TICKS, with_cmdline=True)
+    assert info.name == "renamed"
+    # recycled pid: new starttime, fresh entry
+    newer = collector.get_static(PID, dict(st, starttime=st["starttime"] + 1), CLOCK_TICKS, False)
+    assert newer is not info and newer.cmdline == ""
+    collector._STATIC.pop(PID, None)
+
+
+def test_cpu_percent_first_sample_is_zero():
+    collector._CPU_PREV.pop(PID, None)
+    t0 = time.monotonic()
+    assert collector.cpu_percent(PID, collector.read_stat(PID), CLOCK_TICKS, t0) == 0.0
+    end = time.process_time() + 0.05
+    while time.process_time() < end:
+        pass
+    pct = collector.cpu_percent(PID, collector.read_stat(PID), CLOCK_TICKS, time.monotonic())
+    assert pct > 0
+    collector._CPU_PREV.pop(PID, None)
+
+
+def test_collect_one_row_has_every_field():
+    row = collector.collect_one(PID, "now", CLOCK_TICKS, time.monotonic(), time.time())
+    assert list(row) == collector.FIELDNAMES
+    assert row["PID"] == PID and row["Cmdline"] == ""
+    assert collector.collect_one(2 ** 22 + 1, "now", CLOCK_TICKS, 0.0, 0.0) is None
+
+
+def test_sample_once_pool_matches_serial():
+    """The thread-pool fan-out gives the same rows as a serial map; one timestamp per sample."""
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        pooled = collector.sample_once(CLOCK_TICKS, executor=pool)
+    serial = collector.sample_once(CLOCK_TICKS)
+    assert all(list(r) == collector.FIELDNAMES for r in pooled)
+    assert PID in {r["PID"] for r in pooled} & {r["PID"] for r in serial}
+    assert len({r["Timestamp"] for r in pooled}) == 1
+
+
+def _rows():
+    now = "2026-01-01T00:00:00"
+    return [r for r in (collector.collect_one(pid, now, CLOCK_TICKS, time.monotonic(), time.time())
+                        for pid in (PID, os.getppid())) if r is not None]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_text_sinks_append_across_runs(tmp_path, fmt):
+    path = tmp_path / f"out.{fmt}"
+    rows = _rows()
+    for _ in range(2):   # a second run appends (csv header only once)
+        sink = collector.SINKS[fmt](str(path))
+        sink.write(rows)
+        sink.close()
+    df = pd.read_csv(path) if fmt == "csv" else pd.read_json(path, lines=True)
+    assert list(df.columns) == collector.FIELDNAMES
+    assert df["PID"].tolist() == [r["PID"] for r in rows] * 2
+
+
+def test_feather_sink_round_trips(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "out.feather")
+    rows = _rows()
+    sink = collector.FeatherSink(path)
+    sink.write(rows)
+    sink.write([])
+    sink.write(rows)
+    sink.close()
+    df = pd.read_feather(path)
+    assert list(df.columns) == collector.FIELDNAMES
+    assert df["PID"].tolist() == [r["PID"] for r in rows] * 2
+    assert df["Threads"].dtype == "int64" and df["CPU_Usage_%"].dtype == "float64"
+    # one footer per file: a second run must not clobber or corrupt it
+    with pytest.raises(SystemExit):
+        collector.FeatherSink(path)
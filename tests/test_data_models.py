@@ -0,0 +1,57 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from src.scheduler import data_models
+
+DATASET = "datasets/mixed_realistic_workload.csv"
+
+
+def _run_main(monkeypatch, tmp_path, df):
+    src, out = tmp_path / "raw.csv", tmp_path / "out.csv"
+    df.to_csv(src, index=False)
+    monkeypatch.setattr(sys, "argv", ["data_models", "--input", str(src), "--out", str(out)])
+    data_models.main()
+    return pd.read_csv(out)
+
+
+def test_main_keeps_one_row_per_pid(monkeypatch, tmp_path):
+    """Every PID survives, incl. one whose timestamps are all unparseable and a missing PID."""
+    raw = pd.read_csv(DATASET, nrows=400)
+    pids = raw["PID"].drop_duplicates()
+    undated = pids.iloc[3]
+    raw.loc[raw["PID"] == undated, "Timestamp"] = "not a time"
+    raw.loc[5, "PID"] = np.nan
+
+    out = _run_main(monkeypatch, tmp_path, raw)
+
+    # same rows as the old sort_values + drop_duplicates(keep="first")
+    ts = pd.to_datetime(raw["Timestamp"], format="ISO8601", errors="coerce")
+    old = raw.assign(Timestamp=ts).sort_values("Timestamp", kind="stable").drop_duplicates("PID")
+    assert len(out) == len(old) == raw["PID"].nunique(dropna=False)
+    assert out["PID"].isna().sum() == 1
+    # the undated PID sorts last and arrives at 0
+    assert out["PID"].iloc[-1] == undated
+    assert out["Arrival_Sec"].iloc[-1] == 0
+    assert out["Arrival_Sec"].iloc[:-1].is_monotonic_increasing
+
+
+def test_preprocess_all_nan_state_and_int_elapsed():
+    """All-NaN State gives is_sleeping 0; Elapsed_Time_sec without zeros keeps its int dtype."""
+    raw = pd.read_csv(DATASET, nrows=50)
+    raw["State"] = np.nan
+    raw["Elapsed_Time_sec"] = np.arange(1, len(raw) + 1, dtype=np.int64)
+    out = data_models.preprocess_dataset(raw.copy())
+    assert (out["is_sleeping"] == 0).all()
+    assert out["Elapsed_Time_sec"].dtype == np.int64
+    assert np.allclose(out["avg_cpu_time"], raw["Total_Time_Ticks"] / raw["Elapsed_Time_sec"])
+
+
+def test_preprocess_zero_elapsed_becomes_epsilon():
+    raw = pd.read_csv(DATASET, nrows=50)
+    raw["Elapsed_Time_sec"] = 0
+    raw.loc[0, "State"] = "S (sleeping)"
+    out = data_models.preprocess_dataset(raw.copy())
+    assert (out["Elapsed_Time_sec"] == 1e-5).all()
+    assert out["is_sleeping"].iloc[0] == 1
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from src.scheduler.event_log import LogBuffer
+from src.scheduler.task import Task
+
+
+def _make_task(pid, sched, subq, remaining, quantum=None, score=None):
+    t = Task({"PID": pid, "Name": f"p{pid}", "Total_Time_Ticks": remaining,
+              "se.vruntime": 1.5 * pid})
+    t.assigned_scheduler, t.subqueue = sched, subq
+    t.quantum, t.subqueue_score = quantum, score
+    return t
+
+
+def test_logbuffer_matches_list_of_dicts_frame(old_log_row):
+    """to_frame() writes the same CSV as pd.DataFrame(list of dict rows)."""
+    a = _make_task(1, "CFS", "cfs_1", 5)
+    b = _make_task(2, "RR", "rr_1", 3, quantum=100, score=2.75)
+    buf = LogBuffer(capacity=2)   # small capacity so _grow() runs
+    old = []
+    events = [
+        (0, "ADMIT", None, a, None),
+        (0, "ENQUEUE", None, a, None),
+        (0, "ADMIT", None, b, None),
+        (1, "DISPATCH", 0, a, None),
+        (1, "DISPATCH", 1, b, None),
+        (2, "PREEMPT", 1, b, {"reason": "quantum_expired"}),
+        (3, "COMPLETE", 0, a, None),
+        (4, "RUN", None, None, None),
+    ]
+    for time, event, core, task, extra in events:
+        buf.append(time, event, core, getattr(task, "pid", None), task, extra)
+        old.append(old_log_row(time, event, core, task, extra))
+    assert len(buf) == len(old)
+    assert buf.to_frame().to_csv(index=False) == pd.DataFrame(old).to_csv(index=False)
+
+
+def test_append_runs_matches_per_tick_appends():
+    """append_runs() lays RUN rows out tick-major, like one append() per tick and core."""
+    tasks = [_make_task(1, "CFS", "cfs_1", 10), _make_task(2, "FIFO", "fifo_1", 10)]
+    cores = [0, 2]
+    remaining = np.array([[9, 9], [8, 8], [7, 7]], dtype=np.int64)
+    vruntime = np.array([[2.0, 3.0], [3.0, 3.0], [4.0, 3.0]])
+
+    bulk = LogBuffer(capacity=1)
+    bulk.append_runs(5, cores, tasks, remaining, vruntime)
+
+    one_by_one = LogBuffer(capacity=1)
+    for t in range(remaining.shape[0]):
+        for j, (core, task) in enumerate(zip(cores, tasks)):
+            task.remaining, task.vruntime = int(remaining[t, j]), float(vruntime[t, j])
+            one_by_one.append(5 + t, "RUN", core, task.pid, task)
+
+    pd.testing.assert_frame_equal(bulk.to_frame(), one_by_one.to_frame())
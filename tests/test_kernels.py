@@ -0,0 +1,84 @@
+import heapq
+import random
+
+import numpy as np
+
+from src.scheduler.array_heap import ArrayHeap
+from src.scheduler.kernels import (
+    SUBQUEUE_WEIGHTS, advance_ticks, compute_scores_batch, repeat_add,
+)
+
+
+def test_array_heap_pops_in_heapq_order():
+    """ArrayHeap pops (vruntime, seq) minima like heapq, ties in insertion order."""
+    rng = random.Random(0)
+    heap = ArrayHeap(capacity=2)   # forces _grow()
+    ref = []
+    seq = 0
+    popped, expected = [], []
+    for idx in range(300):
+        # few distinct keys so ties on vruntime are common
+        key = float(rng.randint(0, 5))
+        heap.push(key, seq, idx)
+        heapq.heappush(ref, (key, seq, idx))
+        seq += 1
+        if rng.random() < 0.4:
+            assert heap.peek() == ref[0][2]
+            popped.append(heap.pop())
+            expected.append(heapq.heappop(ref)[2])
+    while ref:
+        popped.append(heap.pop())
+        expected.append(heapq.heappop(ref)[2])
+    assert popped == expected
+    assert len(heap) == 0
+
+
+def test_array_heap_tracks_positions():
+    """pos[idx] points at the idx's slot while queued and is -1 once popped."""
+    heap = ArrayHeap(capacity=4)
+    for seq, (key, idx) in enumerate([(3.0, 7), (1.0, 2), (2.0, 5)]):
+        heap.push(key, seq, idx)
+    for idx in (7, 2, 5):
+        assert heap.vals[heap.pos[idx]] == idx
+    assert heap.pop() == 2
+    assert heap.pos[2] == -1
+
+
+def test_repeat_add_rounds_like_a_loop():
+    value, inc = 0.1, 1024.0 / 3.0
+    expected = value
+    for _ in range(1000):
+        expected += inc
+    assert repeat_add(value, inc, 1000) == expected
+
+
+def test_advance_ticks_matches_per_tick_countdown():
+    remaining = np.array([5, 9, 4], dtype=np.int64)
+    vruntime = np.array([0.5, 10.0, 2.0])
+    inc = np.array([1.0 / 3.0, 0.0, 0.7])
+    is_cfs = np.array([True, False, True])
+    rem_ref, vr_ref = remaining.copy(), vruntime.copy()
+    rows = []
+    for _ in range(3):
+        rem_ref -= 1
+        for j in range(3):
+            if is_cfs[j]:
+                vr_ref[j] += inc[j]
+        rows.append((rem_ref.copy(), vr_ref.copy()))
+
+    rem_out, vr_out = advance_ticks(remaining, vruntime, inc, is_cfs, 3)
+    assert np.array_equal(rem_out, np.array([r for r, _ in rows]))
+    assert np.array_equal(vr_out, np.array([v for _, v in rows]))
+    # in-place state is the last tick's
+    assert np.array_equal(remaining, rem_ref)
+    assert np.array_equal(vruntime, vr_ref)
+
+
+def test_compute_scores_batch_matches_scalar_formula():
+    R = np.array([3, 2, 1], dtype=np.float64)
+    I = np.array([4, 1.5, 2], dtype=np.float64)
+    E = np.array([1, 2, 3], dtype=np.float64)
+    P = np.array([3, 3, 1], dtype=np.float64)
+    w_r, w_i, w_e, w_p = SUBQUEUE_WEIGHTS
+    expected = [float(w_r*r + w_i*i + w_e*e + w_p*p) for r, i, e, p in zip(R, I, E, P)]
+    assert compute_scores_batch(R, I, E, P).tolist() == expected
@@ -0,0 +1,113 @@
+import random
+
+import pandas as pd
+
+from src.scheduler.fast_forward import next_event_tick
+from src.scheduler.linux_baseline import LinuxBaselineScheduler
+from src.scheduler.task import Task
+
+POLICIES = ["SCHED_OTHER", "SCHED_OTHER", "SCHED_FIFO", "SCHED_RR", "SCHED_IDLE"]
+
+
+def _workload(n=40, seed=1):
+    rng = random.Random(seed)
+    rows = []
+    for pid in range(1, n + 1):
+        rows.append({
+            "PID": pid, "Name": f"p{pid}",
+            "Arrival_Sec": rng.randint(0, 300),
+            "Total_Time_Ticks": rng.randint(1, 400),
+            "Scheduling_Policy": rng.choice(POLICIES),
+            "se.vruntime": rng.random() * 50,
+            "se.load.weight": rng.choice([1024, 335, 3121, 0]),
+        })
+    return rows
+
+
+def _run(rows, fast_forward, max_ticks=20000, progress_every=1000, sched=None):
+    """The simulator driver loop, with or without the quiet-tick fast-forward."""
+    sched = sched or LinuxBaselineScheduler(num_cores=3)
+    arrivals = {}
+    for row in rows:
+        arrivals.setdefault(row["Arrival_Sec"], []).append(row)
+    arrival_ticks = sorted(arrivals)
+    last_arrival = arrival_ticks[-1]
+    current_time = 0
+    while True:
+        for row in arrivals.get(current_time, []):
+            sched.admit(Task.from_row(row), current_time)
+        if fast_forward:
+            jump_to = next_event_tick(arrival_ticks, current_time, sched,
+                                      progress_every, max_ticks)
+            if jump_to is not None:
+                sched.tick_advance(jump_to - current_time, current_time)
+                current_time = jump_to
+                if current_time > max_ticks:
+                    break
+                continue
+        sched.tick(current_time)
+        if current_time > last_arrival and sched.all_queues_empty():
+            break
+        current_time += 1
+        if current_time > max_ticks:
+            break
+    return sched, current_time
+
+
+def test_fast_forward_matches_tick_by_tick(monkeypatch):
+    """tick_advance over quiet spans gives the same logs and metrics as stepping every tick."""
+    rows = _workload()
+    slow, slow_end = _run(rows, fast_forward=False)
+    stepped = []
+    tick = LinuxBaselineScheduler.tick
+    monkeypatch.setattr(LinuxBaselineScheduler, "tick",
+                        lambda self, t=None: (stepped.append(t), tick(self, t))[1])
+    fast, fast_end = _run(rows, fast_forward=True)
+    assert fast_end == slow_end
+    assert len(stepped) < slow_end / 2   # the quiet spans really were skipped
+    assert slow.completed_tasks   # the workload actually ran
+    assert fast.export_logs().to_csv(index=False) == slow.export_logs().to_csv(index=False)
+    assert (fast.export_task_metrics().to_csv(index=False)
+            == slow.export_task_metrics().to_csv(index=False))
+    assert fast.export_core_ticks().equals(slow.export_core_ticks())
+
+
+def test_ready_mask_tracks_queue_occupancy():
+    """A subqueue's bit is set exactly while that subqueue holds work."""
+    sched = LinuxBaselineScheduler(num_cores=1)
+
+    def check():
+        for (s, q), bit in sched._slot_bit.items():
+            assert bool(sched._ready_mask >> bit & 1) == bool(len(sched.queues[s][q]))
+
+    assert sched.all_queues_empty()
+    for row in _workload(n=12, seed=3):
+        sched.admit(Task.from_row(row), 0)
+        check()
+    assert not sched.all_queues_empty()
+    t = 0
+    while not sched.all_queues_empty():
+        sched.tick(t)
+        check()
+        t += 1
+    assert sched._ready_mask == 0
+    assert len(sched.completed_tasks) == 12
+
+
+def test_pick_follows_core_priority_order():
+    sched = LinuxBaselineScheduler(num_cores=2, core_priority_order={
+        0: ["FIFO", "RR", "CFS", "IDLE"], 1: ["IDLE", "CFS", "RR", "FIFO"]})
+    for pid, pol in [(1, "SCHED_FIFO"), (2, "SCHED_IDLE")]:
+        sched.admit(Task.from_row({"PID": pid, "Total_Time_Ticks": 5,
+                                   "Scheduling_Policy": pol}), 0)
+    assert sched._pick_task_for_core(0) == ("FIFO", "fifo_1")
+    assert sched._pick_task_for_core(1) == ("IDLE", "idle")
+
+
+def test_logs_match_list_of_dicts_frame(record_old_log):
+    """Every event _log writes to the LogBuffer exports like the old list of dict rows."""
+    sched = LinuxBaselineScheduler(num_cores=3)
+    old = record_old_log(sched)
+    _run(_workload(), fast_forward=False, sched=sched)
+    assert {e for e in sched.export_logs()["event"]} >= {"ENQUEUE", "DISPATCH", "RUN", "PREEMPT", "COMPLETE"}
+    assert sched.export_logs().to_csv(index=False) == pd.DataFrame(old).to_csv(index=False)